@@ -1,35 +1,1105 @@
-from flask import Flask, request, jsonify
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import time
+_BOOT_STARTED = time.perf_counter()
+
+# Selenium and webdriver_manager are imported inside the functions that use them
+# so gunicorn workers boot (and answer health checks) without loading them.
+from flask import Flask, Response, has_request_context, request, jsonify, stream_with_context
 import uuid
 import re
+import os
+import queue
+import threading
+import atexit
+import json
+from contextlib import contextmanager
+from functools import wraps
+from collections import OrderedDict, deque
+
+from concurrent.futures import ThreadPoolExecutor
+
+from urllib.parse import urlparse
+
+from broker import BROWSER_BROKER_ADDRESS, connect_broker
+from browsers import (
+    BROWSER_USER_AGENT,
+    DRIVER_POOL_MAX_SIZE,
+    DRIVER_POOL_SIZE,
+    MAX_SESSIONS,
+    NETWORK_IDLE_SIGNAL,
+    PAGE_LOAD_STRATEGY,
+    SESSION_EVICTION_POLICY,
+    SESSION_IDLE_TTL,
+    SESSION_QUEUE_RETRY_AFTER,
+    SESSION_QUEUE_TIMEOUT,
+    DriverPool,
+    create_driver,
+    expired_sessions,
+    plan_admission,
+    quit_driver,
+    resolve_chromedriver_path,
+    start_session_reaper,
+    startup_timings,
+    teardown_session,
+)
+from job_store import JOB_STORE_PATH, JobStore
+from extraction import (
+    IIMJOBS_BASE_URL,
+    COMPANY_SELECTORS,
+    JOB_CONTAINER_SELECTORS,
+    JOB_KEYWORDS,
+    TITLE_SELECTORS,
+    JobDedupIndex,
+    apply_line_fallback,
+    build_job_data,
+    extract_job_details_from_html,
+    extract_jobs_from_html,
+    extract_text_fields,
+    finalize_job_data,
+    job_id_from_link,
+    normalize_link,
+    submit_html_parse,
+)
 
 app = Flask(__name__)
-sessions = {}
-
-def create_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+# How job cards are read: "script" (one execute_script per page), "snapshot"
+# (page_source parsed in a worker process) or "webdriver" (per-element calls)
+EXTRACTION_MODE = os.environ.get("EXTRACTION_MODE", "script")
+EXTRACTION_MODES = ("script", "snapshot", "webdriver")
+
+# Light mode: keep-alive HTTP connections per session and request timeout
+LIGHT_HTTP_POOL_SIZE = int(os.environ.get("LIGHT_HTTP_POOL_SIZE", "10"))
+LIGHT_HTTP_TIMEOUT = float(os.environ.get("LIGHT_HTTP_TIMEOUT", "15"))
+
+# Shared cache of /api/job-details content: freshness, entry count and total size limits
+JOB_DETAILS_CACHE_TTL = float(os.environ.get("JOB_DETAILS_CACHE_TTL", "600"))
+JOB_DETAILS_CACHE_MAX_ENTRIES = int(os.environ.get("JOB_DETAILS_CACHE_MAX_ENTRIES", "1000"))
+JOB_DETAILS_CACHE_MAX_BYTES = int(os.environ.get("JOB_DETAILS_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# /api/job-details/batch: tabs loading at once, per-page timeout and request size limit
+JOB_DETAILS_BATCH_TABS = int(os.environ.get("JOB_DETAILS_BATCH_TABS", "4"))
+JOB_DETAILS_BATCH_PAGE_TIMEOUT = float(os.environ.get("JOB_DETAILS_BATCH_PAGE_TIMEOUT", "30"))
+JOB_DETAILS_BATCH_MAX_ITEMS = int(os.environ.get("JOB_DETAILS_BATCH_MAX_ITEMS", "100"))
+
+# Browsers scraping search categories at once; 1 keeps everything in the session driver
+CATEGORY_CONCURRENCY = int(os.environ.get("CATEGORY_CONCURRENCY", "1"))
+
+# Background tasks (/api/tasks): browser-bound tasks running at once, and how long finished ones are kept
+TASK_MAX_BROWSER_WORKERS = int(os.environ.get("TASK_MAX_BROWSER_WORKERS", "2"))
+TASK_RESULT_TTL = float(os.environ.get("TASK_RESULT_TTL", "3600"))
+
+# Scraped jobs are also written to the local SQLite store served by /api/jobs/search
+JOB_STORE_ENABLED = os.environ.get("JOB_STORE_ENABLED", "1") == "1"
+JOB_SEARCH_MAX_LIMIT = int(os.environ.get("JOB_SEARCH_MAX_LIMIT", "100"))
+# Streamed jobs are written in batches of this size, so a stream holds at most one batch
+STREAM_STORE_BATCH = int(os.environ.get("STREAM_STORE_BATCH", "50"))
+
+# Phase timing histograms served at /metrics: bucket upper bounds in seconds, and whether
+# every JSON response carries a "timings" block (otherwise only when the request asks for one)
+TIMING_BUCKETS = [float(bound) for bound in os.environ.get(
+    "TIMING_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60").split(",")]
+RESPONSE_TIMINGS = os.environ.get("RESPONSE_TIMINGS", "0") == "1"
+
+# Browser profiles: URL patterns a session's browser blocks through DevTools
+# (Network.setBlockedURLs). "lean" drops images, fonts, media and third-party
+# analytics/ad scripts. Stylesheets are kept because scrolling, visibility and
+# element text depend on layout. Logos are read from the img src attribute, so
+# the image itself never needs to download. Patterns match the whole URL, so each
+# extension is blocked with and without a query string.
+LEAN_BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "ogg"
+]
+LEAN_BLOCKED_URLS = [f"*.{extension}{query}" for extension in LEAN_BLOCKED_EXTENSIONS for query in ("", "?*")] + [
+    "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*",
+    "*doubleclick.net*", "*adservice.google.*", "*facebook.net*", "*facebook.com/tr*",
+    "*hotjar.com*", "*clarity.ms*", "*webengage.com*", "*moengage.com*", "*branch.io*"
+]
+BROWSER_PROFILES = {"full": [], "lean": LEAN_BLOCKED_URLS}
+
+# Profile used by each endpoint (view function name) unless the request passes
+# "browser_profile"; override with e.g. ENDPOINT_BROWSER_PROFILES="get_jobs=full,apply_to_job=lean"
+BROWSER_PROFILE_DEFAULT = os.environ.get("BROWSER_PROFILE_DEFAULT", "full")
+ENDPOINT_BROWSER_PROFILES = {
+    "get_jobs": "lean",
+    "stream_jobs": "lean",
+    "get_job_details": "lean",
+    "get_job_details_batch": "lean",
+    "explore_site": "lean"
+}
+ENDPOINT_BROWSER_PROFILES.update(
+    item.split("=", 1) for item in os.environ.get("ENDPOINT_BROWSER_PROFILES", "").split(",") if "=" in item
+)
+
+def browser_profile_for(endpoint, data):
+    return data.get("browser_profile") or ENDPOINT_BROWSER_PROFILES.get(endpoint, BROWSER_PROFILE_DEFAULT)
+
+def apply_browser_profile(driver, profile):
+    """Block the profile's URL patterns in the driver's current tab; False where DevTools is unavailable.
+    Applied on every request, since another worker may share the same browser through the broker"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BROWSER_PROFILES[profile]})
+    except Exception as e:
+        print(f"Could not apply browser profile {profile}: {str(e)}")
+        return False
+    driver.browser_profile = profile  # followed by tabs and clones opened from this driver
+    return True
+
+PAGE_LOAD_METRICS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let transferred = nav ? nav.transferSize : 0;
+let decoded = nav ? nav.decodedBodySize : 0;
+for (const r of resources) {
+    transferred += r.transferSize;
+    decoded += r.decodedBodySize;
+}
+return {
+    resources: resources.length,
+    transfer_bytes: transferred,
+    decoded_bytes: decoded,
+    dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+    load_ms: nav ? Math.round(nav.loadEventEnd) : null
+};
+"""
+
+def page_load_metrics(driver):
+    """Bytes and timings of the current page from the Performance API. Cross-origin
+    resources without Timing-Allow-Origin report 0 bytes, so totals are a lower bound"""
+    try:
+        return driver.execute_script(PAGE_LOAD_METRICS_JS)
+    except Exception as e:
+        print(f"Could not read page load metrics: {str(e)}")
+        return None
+
+def instrument_driver(driver):
+    """Count and time every WebDriver command the driver sends, under phase_timings"""
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            phase_timings.command(driver_command, time.perf_counter() - started)
+
+    driver.execute = timed_execute
     return driver
 
+class CommandCounter:
+    """Counts WebDriver round trips (HTTP commands) issued through a driver while active"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self):
+        with self._lock:
+            self.count += 1
+
+    def __enter__(self):
+        self._had_override = "execute" in vars(self.driver)
+        original = self.driver.execute
+        self._original = original
+
+        def counted_execute(driver_command, params=None):
+            self.add()
+            return original(driver_command, params)
+
+        self._counted_execute = counted_execute
+        self.driver.execute = counted_execute
+        vars(self.driver).setdefault("command_counters", []).append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        counters = vars(self.driver).get("command_counters", [])
+        if self in counters:
+            counters.remove(self)
+        # A suspended generator can exit after an outer counter already restored the driver
+        if vars(self.driver).get("execute") is not self._counted_execute:
+            return False
+        if self._had_override:
+            self.driver.execute = self._original
+        else:
+            del self.driver.execute
+        return False
+
+def launch_instrumented_driver():
+    return instrument_driver(create_driver())
+
+driver_pool = DriverPool(DRIVER_POOL_SIZE, DRIVER_POOL_MAX_SIZE, launch_instrumented_driver)
+atexit.register(driver_pool.shutdown)
+
+def attach_driver(executor_url, webdriver_session_id):
+    """WebDriver client for a browser started by another process (the broker), reusing its session"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+    class AttachedDriver(webdriver.Remote):
+        def start_session(self, capabilities):
+            self.session_id = webdriver_session_id
+
+        def execute_cdp_cmd(self, cmd, cmd_args):
+            return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    connection = ChromiumRemoteConnection(executor_url, vendor_prefix="goog", browser_name="chrome")
+    return instrument_driver(AttachedDriver(command_executor=connection, options=Options()))
+
+# Session fields mirrored to the broker so every worker sees them; the rest
+# (the attached driver, the light-mode HTTP client) stays per process
+SHARED_SESSION_FIELDS = ("email", "application_info")
+
+class BrokeredSession(dict):
+    """This worker's view of a broker session; shared fields are written through to the broker"""
+
+    def __init__(self, registry, session_id, data):
+        super().__init__(data)
+        self._registry = registry
+        self._session_id = session_id
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if key in SHARED_SESSION_FIELDS:
+            self._registry.broker().update(self._session_id, {key: value})
+
+class SessionLimitReached(Exception):
+    """MAX_SESSIONS browsers are in use and none could be evicted"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many active sessions ({MAX_SESSIONS}), try again later")
+        self.retry_after = retry_after
+
+class SessionRegistry:
+    """session_id -> session data ({"driver", "email", ...}), kept in this process or,
+    when BROWSER_BROKER_ADDRESS is set, in the browser broker shared by all workers"""
+
+    def __init__(self, broker_address=None):
+        self.broker_address = broker_address
+        self._local = {}  # session data, or this worker's cached BrokeredSession views
+        self._last_used = {}
+        self._in_use = {}
+        self._pending = set()  # logins in progress, counted against MAX_SESSIONS
+        self._lock = threading.Lock()
+        self._tls = threading.local()
+        self._reaper = None
+        self.stats = {"logouts": 0, "reaped": 0, "evicted": 0, "rejected": 0}
+
+    def broker(self):
+        proxy = getattr(self._tls, "broker", None)
+        if proxy is None:
+            proxy = self._tls.broker = connect_broker(self.broker_address)
+        return proxy
+
+    def _candidates(self):
+        return [(session_id, last_used, self._in_use.get(session_id, 0))
+                for session_id, last_used in self._last_used.items()]
+
+    def launch_driver(self, session_id):
+        """Browser for a login in progress; it becomes a session once stored with sessions[session_id] = ...
+        Raises SessionLimitReached when MAX_SESSIONS are open and none may be evicted"""
+        if self.broker_address:
+            endpoint = self.broker().launch(session_id)
+            if "retry_after" in endpoint:
+                raise SessionLimitReached(endpoint["retry_after"])
+            return attach_driver(endpoint["executor_url"], endpoint["webdriver_session_id"])
+
+        with self._lock:
+            action, detail = plan_admission(self._candidates(), len(self._pending))
+            if action == "reject":
+                self.stats["rejected"] += 1
+                raise SessionLimitReached(detail)
+            self._pending.add(session_id)
+            # Removed under the same lock that found it idle, so no request can pick it up meanwhile
+            evicted = self._remove(detail) if action == "evict" else None
+
+        if evicted is not None:
+            print(f"Evicting least recently used session {detail}")
+            self._teardown(detail, evicted, "evicted")
+        try:
+            return driver_pool.acquire()
+        except Exception:
+            with self._lock:
+                self._pending.discard(session_id)
+            raise
+
+    def discard_driver(self, session_id, driver):
+        """Give up a browser from launch_driver after a failed login"""
+        if self.broker_address:
+            self.broker().close(session_id)
+            return
+        with self._lock:
+            self._pending.discard(session_id)
+        quit_driver(driver)
+
+    def get(self, session_id, default=None):
+        if not self.broker_address:
+            with self._lock:
+                data = self._local.get(session_id, default)
+                if session_id in self._last_used:
+                    self._last_used[session_id] = time.time()
+                return data
+
+        info = self.broker().lookup(session_id)
+        with self._lock:
+            if info is None:
+                stale = self._local.pop(session_id, None)
+                if stale is not None:
+                    teardown_session(dict(stale, driver=None))  # the broker already closed the browser
+                return default
+
+            data = self._local.get(session_id)
+            if data is None or data["driver"].session_id != info["webdriver_session_id"]:
+                driver = attach_driver(info["executor_url"], info["webdriver_session_id"])
+                data = self._local[session_id] = BrokeredSession(self, session_id, {"driver": driver})
+            dict.update(data, info["fields"])
+            return data
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def __getitem__(self, session_id):
+        data = self.get(session_id)
+        if data is None:
+            raise KeyError(session_id)
+        return data
+
+    def __setitem__(self, session_id, data):
+        if not self.broker_address:
+            with self._lock:
+                self._pending.discard(session_id)
+                self._local[session_id] = data
+                self._last_used[session_id] = time.time()
+            return
+
+        fields = {key: value for key, value in data.items() if key in SHARED_SESSION_FIELDS}
+        self.broker().register(session_id, fields)
+        with self._lock:
+            self._local[session_id] = BrokeredSession(self, session_id, data)
+
+    def _remove(self, session_id):
+        """Forget a session in this process; call with self._lock held"""
+        self._last_used.pop(session_id, None)
+        self._in_use.pop(session_id, None)
+        return self._local.pop(session_id, None)
+
+    def _teardown(self, session_id, data, reason):
+        session_scheduler.forget(session_id)
+        teardown_session(data)
+        with self._lock:
+            self.stats["logouts" if reason == "logout" else reason] += 1
+
+    def close(self, session_id, reason="logout"):
+        """Tear the session down and forget it; False if it did not exist"""
+        with self._lock:
+            data = self._remove(session_id)
+
+        if self.broker_address:
+            session_scheduler.forget(session_id)
+            if data is not None:
+                teardown_session(dict(data, driver=None))  # the broker quits the browser
+            return self.broker().close(session_id, reason)
+
+        if data is None:
+            return False
+        self._teardown(session_id, data, reason)
+        return True
+
+    def __delitem__(self, session_id):
+        if not self.close(session_id):
+            raise KeyError(session_id)
+
+    @contextmanager
+    def using(self, session_id):
+        """Mark the session busy for the duration of a request so it is neither reaped nor evicted"""
+        if self.broker_address:
+            self.broker().begin_use(session_id)
+        else:
+            with self._lock:
+                self._in_use[session_id] = self._in_use.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            if self.broker_address:
+                self.broker().end_use(session_id)
+            else:
+                with self._lock:
+                    if session_id in self._in_use:
+                        self._in_use[session_id] -= 1
+                    if session_id in self._last_used:
+                        self._last_used[session_id] = time.time()
+
+    @contextmanager
+    def lease(self, session_id, timeout):
+        """Exclusive use of the session's browser across workers. Only the broker needs one: every
+        worker attaches to the same Chrome, and the scheduler only orders requests within a process"""
+        if not self.broker_address:
+            yield
+            return
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        if self.broker().acquire(session_id, owner, timeout) is False:
+            raise SessionBusy(f"Session busy in another worker for {timeout:.1f}s")
+        try:
+            yield
+        finally:
+            self.broker().release(session_id, owner)
+
+    def reap_idle(self):
+        with self._lock:
+            expired = [(session_id, self._remove(session_id)) for session_id in expired_sessions(self._candidates())]
+        for session_id, data in expired:
+            print(f"Reaping session {session_id}, idle for more than {SESSION_IDLE_TTL}s")
+            self._teardown(session_id, data, "reaped")
+        return len(expired)
+
+    def start_reaper(self):
+        # With a broker, the broker process reaps its own sessions
+        if self.broker_address or self._reaper is not None:
+            return
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = start_session_reaper(self.reap_idle)
+
+    def __len__(self):
+        if not self.broker_address:
+            return len(self._local)
+        return self.broker().count()
+
+    def snapshot(self):
+        if self.broker_address:
+            return self.broker().snapshot()
+
+        now = time.time()
+        with self._lock:
+            stats = dict(self.stats)
+            stats["active"] = len(self._local)
+            stats["pending_logins"] = len(self._pending)
+            stats["in_use"] = sum(1 for count in self._in_use.values() if count)
+            stats["max_idle_seconds"] = round(max((now - last_used for last_used in self._last_used.values()), default=0.0), 1)
+        stats["max_sessions"] = MAX_SESSIONS
+        stats["idle_ttl_seconds"] = SESSION_IDLE_TTL
+        stats["eviction_policy"] = SESSION_EVICTION_POLICY
+        return stats
+
+sessions = SessionRegistry(BROWSER_BROKER_ADDRESS)
+
+class SessionBusy(Exception):
+    """A request gave up waiting for its turn on a session's browser"""
+
+class SessionScheduler:
+    """Serves requests for the same session one at a time in arrival order; different sessions run in parallel"""
+
+    def __init__(self, queue_timeout):
+        self.queue_timeout = queue_timeout
+        self._lanes = {}
+        self._lock = threading.Lock()
+        self.stats = {"served": 0, "timeouts": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    def _lane(self, session_id):
+        with self._lock:
+            lane = self._lanes.get(session_id)
+            if lane is None:
+                # FIFO ticket lock: next_ticket is handed out on arrival, serving is the ticket allowed to run
+                lane = {"cond": threading.Condition(), "next_ticket": 0, "serving": 0, "waiting": 0, "abandoned": set()}
+                self._lanes[session_id] = lane
+            return lane
+
+    def _record(self, waited, served):
+        with self._lock:
+            if served:
+                self.stats["served"] += 1
+            else:
+                self.stats["timeouts"] += 1
+            self.stats["total_wait_seconds"] = round(self.stats["total_wait_seconds"] + waited, 3)
+            self.stats["max_wait_seconds"] = round(max(self.stats["max_wait_seconds"], waited), 3)
+
+    @contextmanager
+    def turn(self, session_id, timeout=None):
+        """Block until every earlier request for session_id has finished; raises SessionBusy on timeout"""
+        lane = self._lane(session_id)
+        cond = lane["cond"]
+        started = time.perf_counter()
+
+        with cond:
+            ticket = lane["next_ticket"]
+            lane["next_ticket"] += 1
+            lane["waiting"] += 1
+            ready = cond.wait_for(lambda: lane["serving"] == ticket, timeout or self.queue_timeout)
+            lane["waiting"] -= 1
+            if not ready:
+                # Skipped when the queue reaches it, so later requests keep their order
+                lane["abandoned"].add(ticket)
+
+        waited = time.perf_counter() - started
+        self._record(waited, ready)
+        if not ready:
+            raise SessionBusy(f"Session busy for {waited:.1f}s")
+
+        try:
+            yield waited
+        finally:
+            with cond:
+                lane["serving"] += 1
+                while lane["serving"] in lane["abandoned"]:
+                    lane["abandoned"].remove(lane["serving"])
+                    lane["serving"] += 1
+                cond.notify_all()
+
+    def forget(self, session_id):
+        with self._lock:
+            self._lanes.pop(session_id, None)
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            lanes = list(self._lanes.values())
+        queued = [lane["waiting"] for lane in lanes]
+        stats["avg_wait_seconds"] = round(stats["total_wait_seconds"] / stats["served"], 3) if stats["served"] else 0.0
+        stats["sessions"] = len(lanes)
+        stats["queued_requests"] = sum(queued)
+        stats["max_session_queue"] = max(queued, default=0)
+        return stats
+
+session_scheduler = SessionScheduler(SESSION_QUEUE_TIMEOUT)
+
+def session_busy_response(e):
+    response = jsonify({"error": f"{str(e)}; other requests for this session are still running, try again later"})
+    response.headers["Retry-After"] = str(int(SESSION_QUEUE_RETRY_AFTER))
+    return response, 429
+
+@contextmanager
+def session_turn(session_id):
+    """This request's turn on the session's browser: in arrival order within this process,
+    then under the broker's lease across workers. Raises SessionBusy after SESSION_QUEUE_TIMEOUT"""
+    with sessions.using(session_id), session_scheduler.turn(session_id) as waited:
+        with sessions.lease(session_id, max(1.0, SESSION_QUEUE_TIMEOUT - waited)):
+            yield
+
+def serialized_per_session(view):
+    """Run the view only after earlier requests for the same session_id have finished"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        data = request.get_json(silent=True)
+        if data is not None and not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        session_id = (data or {}).get("session_id")
+        if not session_id or session_id not in sessions:
+            return view(*args, **kwargs)  # the view reports the invalid session
+        profile = browser_profile_for(view.__name__, data)
+        if profile not in BROWSER_PROFILES:
+            return jsonify({"error": f"browser_profile must be one of: {', '.join(BROWSER_PROFILES)}"}), 400
+
+        try:
+            with session_turn(session_id):
+                session_data = sessions.get(session_id)
+                if session_data is None:
+                    return view(*args, **kwargs)  # closed while this request waited
+                apply_browser_profile(session_data["driver"], profile)
+                return view(*args, **kwargs)
+        except SessionBusy as e:
+            return session_busy_response(e)
+    return wrapper
+
+# Readiness waits: each one polls a concrete page signal until it holds or the
+# timeout passes, and records how long it actually waited.
+READY_POLL_INTERVAL = float(os.environ.get("READY_POLL_INTERVAL", "0.2"))
+NETWORK_QUIET_WINDOW = float(os.environ.get("NETWORK_QUIET_WINDOW", "0.5"))
+
+# In-flight requests the "devtools" idle signal tolerates (long polls, analytics beacons),
+# and request types it never waits for because they stay open for the page's lifetime
+NETWORK_IDLE_MAX_INFLIGHT = int(os.environ.get("NETWORK_IDLE_MAX_INFLIGHT", "2"))
+LONG_LIVED_REQUEST_TYPES = {"EventSource", "WebSocket", "Ping"}
+
+# How long an infinite-scroll step waits for new job cards (or page growth) to appear
+SCROLL_NEW_CARDS_TIMEOUT = float(os.environ.get("SCROLL_NEW_CARDS_TIMEOUT", "5"))
+
+# Target selectors that mean a page type has rendered what we extract
+FEED_READY_SELECTOR = "[data-job-id], .job-item, .job-card, .feed-item, .job-listing, .job-row, .job-tile, .job-container"
+JOB_PAGE_READY_SELECTOR = "h1"
+
+class PhaseTimings:
+    """Histograms of time spent per endpoint and phase: navigate, wait, find_containers,
+    collect_cards, extract_card, snapshot_parse, scroll, submit and every webdriver_command.
+    Phases nest (a scroll includes its waits and commands), so they do not add up to the
+    request total. Each thread also keeps a breakdown of the request it is serving, and
+    worker threads started for a request adopt that request's breakdown"""
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._histograms = {}  # (endpoint, phase) -> {"buckets": cumulative counts, "sum", "count"}
+        self._commands = {}  # (endpoint, command) -> count
+
+    def begin(self, endpoint):
+        """Start the breakdown of the request this thread is about to serve"""
+        self._local.trace = {"endpoint": endpoint, "started": time.perf_counter(), "commands": 0, "phases": {}}
+
+    def end(self):
+        """Finish this thread's request: records its total and returns the breakdown, or None"""
+        trace = getattr(self._local, "trace", None)
+        if trace is None:
+            return None
+        self._local.trace = None
+        total = time.perf_counter() - trace["started"]
+        self._record(trace["endpoint"], "request", total)
+        with self._lock:
+            return {
+                "total_seconds": round(total, 3),
+                "webdriver_commands": trace["commands"],
+                "phases": {
+                    phase: {"count": entry["count"], "seconds": round(entry["seconds"], 3)}
+                    for phase, entry in trace["phases"].items()
+                }
+            }
+
+    def current(self):
+        """This thread's request breakdown, to hand to worker threads it starts"""
+        return getattr(self._local, "trace", None)
+
+    @contextmanager
+    def adopt(self, trace):
+        """Record this thread's phases and commands into another thread's request breakdown"""
+        previous = getattr(self._local, "trace", None)
+        self._local.trace = trace
+        try:
+            yield
+        finally:
+            self._local.trace = previous
+
+    def _current(self):
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            return trace, trace["endpoint"]
+        # Streamed responses run after the request's own breakdown has been returned
+        if has_request_context() and request.url_rule is not None:
+            return None, request.url_rule.rule
+        return None, "background"
+
+    def _record(self, endpoint, phase, seconds):
+        with self._lock:
+            histogram = self._histograms.get((endpoint, phase))
+            if histogram is None:
+                histogram = self._histograms[(endpoint, phase)] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    def observe(self, phase, seconds):
+        trace, endpoint = self._current()
+        self._record(endpoint, phase, seconds)
+        if trace is not None:
+            with self._lock:
+                entry = trace["phases"].setdefault(phase, {"count": 0, "seconds": 0.0})
+                entry["count"] += 1
+                entry["seconds"] += seconds
+
+    def command(self, name, seconds):
+        """One WebDriver command: counted by name and timed as the webdriver_command phase"""
+        trace, endpoint = self._current()
+        with self._lock:
+            self._commands[(endpoint, name)] = self._commands.get((endpoint, name), 0) + 1
+            if trace is not None:
+                trace["commands"] += 1
+        self.observe("webdriver_command", seconds)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def timed(self, name):
+        """Decorator timing every call of a function as phase name"""
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render(self):
+        """Prometheus text exposition of the histograms and command counters"""
+        def labels(**values):
+            escaped = {key: str(value).replace("\\", "\\\\").replace('"', '\\"') for key, value in values.items()}
+            return "{" + ",".join(f'{key}="{value}"' for key, value in escaped.items()) + "}"
+
+        with self._lock:
+            histograms = {key: dict(entry, buckets=list(entry["buckets"])) for key, entry in self._histograms.items()}
+            commands = dict(self._commands)
+
+        lines = [
+            "# HELP iimjobs_phase_seconds Time spent in each phase of handling a request",
+            "# TYPE iimjobs_phase_seconds histogram"
+        ]
+        for (endpoint, phase), entry in sorted(histograms.items()):
+            for bound, count in zip(self.buckets, entry["buckets"]):
+                lines.append(f"iimjobs_phase_seconds_bucket{labels(endpoint=endpoint, phase=phase, le=f'{bound:g}')} {count}")
+            lines.append(f"iimjobs_phase_seconds_bucket{labels(endpoint=endpoint, phase=phase, le='+Inf')} {entry['count']}")
+            lines.append(f"iimjobs_phase_seconds_sum{labels(endpoint=endpoint, phase=phase)} {entry['sum']:.6f}")
+            lines.append(f"iimjobs_phase_seconds_count{labels(endpoint=endpoint, phase=phase)} {entry['count']}")
+
+        lines.append("# HELP iimjobs_webdriver_commands_total WebDriver commands sent, by endpoint and command")
+        lines.append("# TYPE iimjobs_webdriver_commands_total counter")
+        for (endpoint, name), count in sorted(commands.items()):
+            lines.append(f"iimjobs_webdriver_commands_total{labels(endpoint=endpoint, command=name)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {}
+            for (endpoint, phase), entry in sorted(self._histograms.items()):
+                endpoints.setdefault(endpoint, {})[phase] = {
+                    "count": entry["count"],
+                    "total_seconds": round(entry["sum"], 3),
+                    "avg_seconds": round(entry["sum"] / entry["count"], 4)
+                }
+            return {"endpoints": endpoints, "webdriver_commands": sum(self._commands.values())}
+
+phase_timings = PhaseTimings(TIMING_BUCKETS)
+
+readiness_stats = {}
+_readiness_lock = threading.Lock()
+
+def record_wait(name, seconds, satisfied):
+    phase_timings.observe("wait", seconds)
+    with _readiness_lock:
+        entry = readiness_stats.setdefault(name, {
+            "count": 0,
+            "timeouts": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+            "last_seconds": 0.0
+        })
+        entry["count"] += 1
+        entry["total_seconds"] = round(entry["total_seconds"] + seconds, 3)
+        entry["max_seconds"] = round(max(entry["max_seconds"], seconds), 3)
+        entry["last_seconds"] = round(seconds, 3)
+        if not satisfied:
+            entry["timeouts"] += 1
+
+def readiness_snapshot():
+    with _readiness_lock:
+        return {name: dict(entry) for name, entry in readiness_stats.items()}
+
+def wait_until(driver, condition, timeout, name):
+    """Poll condition(driver) until it returns something truthy; returns it, or False on timeout"""
+    started = time.perf_counter()
+    result = False
+
+    while True:
+        try:
+            result = condition(driver)
+        except Exception:
+            result = False
+        if result or time.perf_counter() - started >= timeout:
+            break
+        time.sleep(READY_POLL_INTERVAL)
+
+    record_wait(name, time.perf_counter() - started, bool(result))
+    return result
+
+def wait_for_document_ready(driver, timeout=15):
+    return wait_until(
+        driver,
+        lambda d: d.execute_script("return document.readyState") == "complete",
+        timeout,
+        "document_ready"
+    )
+
+def wait_for_url_change(driver, old_url, timeout=10):
+    return wait_until(driver, lambda d: d.current_url != old_url, timeout, "url_change")
+
+def wait_for_element_count(driver, by, selector, min_count=1, timeout=10):
+    """Wait until at least min_count elements match; returns the elements"""
+    def enough_elements(d):
+        elements = d.find_elements(by, selector)
+        return elements if len(elements) >= min_count else False
+
+    return wait_until(driver, enough_elements, timeout, "element_count") or []
+
+def wait_for_height_growth(driver, old_height, timeout=5):
+    """Wait for the document to grow past old_height, e.g. after an infinite-scroll trigger"""
+    return wait_until(
+        driver,
+        lambda d: d.execute_script("return document.body.scrollHeight") > old_height,
+        timeout,
+        "height_growth"
+    )
+
+def resource_quiet_condition(quiet_window):
+    """True once no new resources have been fetched for quiet_window seconds"""
+    state = {"count": -1, "changed_at": time.perf_counter()}
+
+    def network_quiet(d):
+        count = d.execute_script(
+            "return document.readyState === 'loading' ? -1 : performance.getEntriesByType('resource').length"
+        )
+        now = time.perf_counter()
+        if count != state["count"]:
+            state["count"] = count
+            state["changed_at"] = now
+            return False
+        return count >= 0 and now - state["changed_at"] >= quiet_window
+
+    return network_quiet
+
+def devtools_idle_condition(driver, quiet_window, max_inflight):
+    """True once at most max_inflight requests have been in flight for quiet_window seconds,
+    tracked from Network events in the performance log; None when the driver has no such log"""
+    inflight = set()
+    state = {"idle_since": None}
+
+    def consume(entries):
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            if method == "Network.requestWillBeSent":
+                if message["params"].get("type") not in LONG_LIVED_REQUEST_TYPES:
+                    inflight.add(message["params"]["requestId"])
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                inflight.discard(message["params"]["requestId"])
+
+    try:
+        consume(driver.get_log("performance"))
+    except Exception:
+        return None
+
+    def network_idle(d):
+        consume(d.get_log("performance"))
+        now = time.perf_counter()
+        if len(inflight) > max_inflight:
+            state["idle_since"] = None
+            return False
+        if state["idle_since"] is None:
+            state["idle_since"] = now
+        return now - state["idle_since"] >= quiet_window
+
+    return network_idle
+
+def drain_performance_log(driver):
+    """Drop buffered performance log entries so the next idle wait only sees the new page"""
+    if NETWORK_IDLE_SIGNAL == "devtools":
+        try:
+            driver.get_log("performance")
+        except Exception:
+            pass
+
+def wait_for_network_quiet(driver, quiet_window=None, timeout=10):
+    """Wait until no new resources have been fetched for quiet_window seconds"""
+    quiet_window = NETWORK_QUIET_WINDOW if quiet_window is None else quiet_window
+    return wait_until(driver, resource_quiet_condition(quiet_window), timeout, "network_quiet")
+
+def wait_for_network_idle(driver, quiet_window=None, timeout=10, ready_selector=None):
+    """Wait for the NETWORK_IDLE_SIGNAL idle condition, or for ready_selector to match, whichever comes first"""
+    quiet_window = NETWORK_QUIET_WINDOW if quiet_window is None else quiet_window
+    name = "network_idle"
+    condition = None
+    if NETWORK_IDLE_SIGNAL == "devtools":
+        condition = devtools_idle_condition(driver, quiet_window, NETWORK_IDLE_MAX_INFLIGHT)
+    if condition is None:
+        name = "network_quiet"
+        condition = resource_quiet_condition(quiet_window)
+
+    if ready_selector:
+        idle = condition
+        name = f"{name}_or_selector"
+
+        def condition(d):
+            return bool(d.find_elements("css selector", ready_selector)) or idle(d)
+
+    return wait_until(driver, condition, timeout, name)
+
+def submit_snapshot_parse(driver, max_jobs, skip=()):
+    """Capture the current page once and parse it in the pool; returns a Future of jobs"""
+    return submit_html_parse(driver.page_source, max_jobs, driver.current_url, skip)
+
+def wait_for_dom_ready(driver, timeout=15):
+    """DOMContentLoaded has fired; what the eager strategy waits for before returning from get()"""
+    return wait_until(
+        driver,
+        lambda d: d.execute_script("return document.readyState") != "loading",
+        timeout,
+        "dom_ready"
+    )
+
+def wait_for_page_ready(driver, timeout=15, ready_selector=None):
+    """Document loaded, then network idle, sharing one timeout budget. Under the eager
+    strategy (document only parsed) ready_selector appearing also ends the wait"""
+    started = time.perf_counter()
+    if PAGE_LOAD_STRATEGY == "eager":
+        wait_for_dom_ready(driver, timeout)
+    else:
+        wait_for_document_ready(driver, timeout)
+        ready_selector = None
+    remaining = max(0.5, timeout - (time.perf_counter() - started))
+    return wait_for_network_idle(driver, timeout=remaining, ready_selector=ready_selector)
+
+navigation_stats = {}
+
+def navigate(driver, url, page_type, timeout=15, ready_selector=None):
+    """driver.get(url) followed by wait_for_page_ready, recording both latencies under page_type"""
+    drain_performance_log(driver)
+    started = time.perf_counter()
+    driver.get(url)
+    loaded = time.perf_counter()
+    phase_timings.observe("navigate", loaded - started)
+    ready = wait_for_page_ready(driver, timeout, ready_selector)
+    finished = time.perf_counter()
+
+    with _readiness_lock:
+        entry = navigation_stats.setdefault(page_type, {
+            "count": 0,
+            "not_ready": 0,
+            "get_seconds": 0.0,
+            "ready_seconds": 0.0,
+            "max_total_seconds": 0.0
+        })
+        entry["count"] += 1
+        entry["get_seconds"] = round(entry["get_seconds"] + loaded - started, 3)
+        entry["ready_seconds"] = round(entry["ready_seconds"] + finished - loaded, 3)
+        entry["max_total_seconds"] = round(max(entry["max_total_seconds"], finished - started), 3)
+        if not ready:
+            entry["not_ready"] += 1
+    return ready
+
+def navigation_snapshot():
+    with _readiness_lock:
+        pages = {
+            page_type: dict(
+                entry,
+                avg_get_seconds=round(entry["get_seconds"] / entry["count"], 3),
+                avg_ready_seconds=round(entry["ready_seconds"] / entry["count"], 3)
+            )
+            for page_type, entry in navigation_stats.items()
+        }
+    return {"page_load_strategy": PAGE_LOAD_STRATEGY, "network_idle_signal": NETWORK_IDLE_SIGNAL, "pages": pages}
+
+@app.before_request
+def begin_request_timings():
+    task_kind = request.environ.get("iimjobs.task_kind")  # set by TaskManager
+    if task_kind:
+        phase_timings.begin(f"task:{task_kind}")
+    else:
+        phase_timings.begin(request.url_rule.rule if request.url_rule is not None else "unmatched")
+
+@app.after_request
+def attach_request_timings(response):
+    """Record the request's total and, when asked for, add its breakdown to a JSON body"""
+    timings = phase_timings.end()
+    payload = request.get_json(silent=True) if request.is_json else None
+    wanted = RESPONSE_TIMINGS or request.args.get("timings") == "1" or (
+        isinstance(payload, dict) and payload.get("timings")
+    )
+    if timings and wanted and response.is_json and not response.is_streamed:
+        body = response.get_json()
+        if isinstance(body, dict):
+            body["timings"] = timings
+            response.set_data(app.json.dumps(body))
+    return response
+
+@app.before_request
+def warm_driver_pool():
+    # Also called from gunicorn's post_fork hook and the dev server's __main__ block.
+    # With a broker, browsers are launched and reaped by the broker process instead
+    if not BROWSER_BROKER_ADDRESS:
+        driver_pool.start()
+        sessions.start_reaper()
+
+# Light mode: after login, pages are fetched over plain HTTP with the browser's
+# cookies and parsed from HTML. The driver is only used when a page needs
+# JavaScript to render what we extract.
+def light_http_client(session_data, refresh_cookies=False):
+    """Keep-alive requests.Session carrying the driver's cookies, one per API session"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    http = session_data.get("http")
+    if http is None:
+        http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=LIGHT_HTTP_POOL_SIZE, pool_maxsize=LIGHT_HTTP_POOL_SIZE)
+        http.mount("http://", adapter)
+        http.mount("https://", adapter)
+        http.headers.update({
+            "User-Agent": BROWSER_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+        })
+        session_data["http"] = http
+        refresh_cookies = True
+
+    if refresh_cookies:
+        for cookie in session_data["driver"].get_cookies():
+            http.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/")
+            )
+
+    return http
+
+def fetch_page_light(session_data, url):
+    """(html, final_url) fetched over HTTP, or None on errors and redirects to the login page.
+    A 401/403 or login redirect is retried once with cookies re-copied from the browser,
+    which keeps the session alive when the site rotates them"""
+    for refresh_cookies in (False, True):
+        http = light_http_client(session_data, refresh_cookies)
+        try:
+            response = http.get(url, timeout=LIGHT_HTTP_TIMEOUT)
+        except Exception as e:
+            print(f"Light fetch of {url} failed: {str(e)}")
+            return None
+
+        logged_out = response.status_code in (401, 403) or urlparse(response.url).path.rstrip("/").endswith("/login")
+        if logged_out and not refresh_cookies:
+            print(f"Light fetch of {url} was not signed in, refreshing cookies from the browser")
+            continue
+        if response.status_code != 200 or logged_out:
+            print(f"Light fetch of {url} returned {response.status_code} at {response.url}")
+            return None
+        return response.text, response.url
+
+def fetch_jobs_light(session_data, max_jobs, dedup):
+    """Same sources as get_jobs over HTTP; returns (jobs, method), or ([], None) if the pages need a browser"""
+    sources = [
+        ("light_jobfeed", f"{IIMJOBS_BASE_URL}/jobfeed"),
+        ("light_jobs_page", f"{IIMJOBS_BASE_URL}/jobs"),
+        ("light_search_page", f"{IIMJOBS_BASE_URL}/j")
+    ]
+
+    for method, url in sources:
+        page = fetch_page_light(session_data, url)
+        if page:
+            jobs = dedup.add_page(extract_jobs_from_html(page[0], max_jobs, page[1]), url)
+            if jobs:
+                return jobs[:max_jobs], method
+
+    jobs = []
+    for url in category_search_urls():
+        if len(jobs) >= max_jobs:
+            break
+        page = fetch_page_light(session_data, url)
+        if page:
+            jobs.extend(dedup.add_page(extract_jobs_from_html(page[0], max_jobs - len(jobs), page[1]), url))
+
+    if jobs:
+        return jobs[:max_jobs], "light_multiple_categories"
+    return [], None
+
 @app.route("/api/login", methods=["POST"])
 def login():
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     data = request.json
     email = data.get("email")
     password = data.get("password")
@@ -37,11 +1107,16 @@ def login():
     if not email or not password:
         return jsonify({"error": "Email and password are required"}), 400
 
-    driver = create_driver()
     session_id = str(uuid.uuid4())
+    try:
+        driver = sessions.launch_driver(session_id)
+    except SessionLimitReached as e:
+        response = jsonify({"error": str(e), "retry_after": e.retry_after})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
     
     try:
-        driver.get("https://www.iimjobs.com/login")
+        navigate(driver, f"{IIMJOBS_BASE_URL}/login", "login", ready_selector="input[name='email']")
         wait = WebDriverWait(driver, 10)
         
         # Wait for and fill email field
@@ -56,10 +1131,13 @@ def login():
         
         # Click login button
         login_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Login')] | //input[@type='submit' and @value='Login']")))
-        driver.execute_script("arguments[0].click();", login_button)
-        
-        # Wait for login to complete
-        time.sleep(5)
+        login_url = driver.current_url
+        with phase_timings.phase("submit"):
+            driver.execute_script("arguments[0].click();", login_button)
+            
+            # Wait for login to complete: redirect away from the login page, then the landing page settles
+            wait_for_url_change(driver, login_url, timeout=10)
+            wait_for_page_ready(driver, timeout=10)
         
         # Check if login was successful by looking for logout link or dashboard
         if ("dashboard" in driver.current_url.lower() or 
@@ -70,140 +1148,402 @@ def login():
             return jsonify({"message": "Login successful", "session_id": session_id}), 200
         else:
             driver.save_screenshot("login_failed.png")
-            driver.quit()
+            sessions.discard_driver(session_id, driver)
             return jsonify({"error": "Login failed. Check credentials."}), 401
 
     except Exception as e:
-        driver.quit()
+        sessions.discard_driver(session_id, driver)
         return jsonify({"error": f"Login error: {str(e)}"}), 500
 
 @app.route("/api/jobs", methods=["POST"])
+@serialized_per_session
 def get_jobs():
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     data = request.json
     session_id = data.get("session_id")
     max_jobs = data.get("max_jobs", 100)  # Allow client to specify max jobs, default to 100
     scroll_pages = data.get("scroll_pages", 5)  # Number of pages to scroll through
+    extraction_mode = data.get("extraction_mode", EXTRACTION_MODE)  # "script", "snapshot" or "webdriver"
+    category_concurrency = data.get("category_concurrency", CATEGORY_CONCURRENCY)  # Browsers for the category fallback
+    light = data.get("light", False)  # Fetch pages over HTTP, using the browser only as a fallback
+    # Only jobs that are new or changed since this user's last scrape. The paginated browser
+    # sources also stop scrolling early; light mode and the category fallback still fetch
+    # every page and only filter the response
+    incremental = data.get("incremental", False)
     
     if not session_id or session_id not in sessions:
         return jsonify({"error": "Invalid session. Please login first."}), 403
+    if extraction_mode not in EXTRACTION_MODES:
+        return jsonify({"error": f"extraction_mode must be one of: {', '.join(EXTRACTION_MODES)}"}), 400
+    if not isinstance(category_concurrency, int) or category_concurrency < 1:
+        return jsonify({"error": "category_concurrency must be a positive integer"}), 400
 
     session_data = sessions[session_id]
     driver = session_data["driver"]
+    user = session_data.get("email")
+
+    def watermark_for(source):
+        return job_store.load_watermark(user, source) if incremental else None
+
+    def found_any(jobs, watermark):
+        # In incremental mode "nothing new" is an answer, not a reason to try the next method
+        return bool(jobs) or bool(watermark and watermark.seen)
+
+    def jobs_response(jobs, method, round_trips, dedup, watermark=None):
+        response = {
+            "jobs": jobs,
+            "count": len(jobs),
+            "method": method,
+            "extraction_mode": extraction_mode,
+            "webdriver_round_trips": round_trips,
+            "deduplication": dedup.summary(),
+            # Known jobs are stored too, so their last_seen keeps advancing
+            "store": store_jobs(jobs + watermark.unchanged if watermark is not None else jobs)
+        }
+        if watermark is not None:
+            response["incremental"] = watermark.summary()
+            job_store.save_watermark(user, method, watermark)
+        return jsonify(response), 200
 
     try:
-        jobs = []
-        wait = WebDriverWait(driver, 15)
+        with CommandCounter(driver) as commands:
+            jobs = []
+            wait = WebDriverWait(driver, 15)
         
-        print(f"Accessing IIMJobs jobfeed... Target: {max_jobs} jobs, Scroll pages: {scroll_pages}")
+            print(f"Accessing IIMJobs jobfeed... Target: {max_jobs} jobs, Scroll pages: {scroll_pages}")
         
-        # Method 1: Direct access to jobfeed with pagination
-        try:
-            driver.get("https://www.iimjobs.com/jobfeed")
-            time.sleep(5)  # Wait for page to load completely
+            # Light mode: plain HTTP with the session's cookies, no scrolling
+            if light:
+                dedup = JobDedupIndex()
+                jobs, method = fetch_jobs_light(session_data, max_jobs, dedup)
+                if jobs:
+                    watermark = watermark_for(method)
+                    if watermark is not None:
+                        jobs = watermark.filter(jobs)
+                    return jobs_response(jobs, method, commands.count, dedup, watermark)
+                print("Light mode found no jobs in the static HTML, falling back to the browser")
+        
+            # Method 1: Direct access to jobfeed with pagination
+            try:
+                navigate(driver, f"{IIMJOBS_BASE_URL}/jobfeed", "job_feed", ready_selector=FEED_READY_SELECTOR)
             
-            # Wait for job listings to load
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                # Wait for job listings to load
+                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             
-            jobs = extract_iimjobs_feed_with_pagination(driver, max_jobs, scroll_pages)
-            if jobs:
-                return jsonify({"jobs": jobs, "count": len(jobs), "method": "direct_jobfeed_paginated"}), 200
+                dedup = JobDedupIndex()
+                watermark = watermark_for("direct_jobfeed_paginated")
+                jobs = extract_iimjobs_feed_with_pagination(driver, max_jobs, scroll_pages, extraction_mode, dedup, watermark)
+                if found_any(jobs, watermark):
+                    return jobs_response(jobs, "direct_jobfeed_paginated", commands.count, dedup, watermark)
                 
-        except Exception as e:
-            print(f"Direct jobfeed access failed: {str(e)}")
+            except Exception as e:
+                print(f"Direct jobfeed access failed: {str(e)}")
         
-        # Method 2: Try alternative job listing page with pagination
-        try:
-            driver.get("https://www.iimjobs.com/jobs")
-            time.sleep(5)
+            # Method 2: Try alternative job listing page with pagination
+            try:
+                navigate(driver, f"{IIMJOBS_BASE_URL}/jobs", "job_feed", ready_selector=FEED_READY_SELECTOR)
             
-            jobs = extract_iimjobs_feed_with_pagination(driver, max_jobs, scroll_pages)
-            if jobs:
-                return jsonify({"jobs": jobs, "count": len(jobs), "method": "jobs_page_paginated"}), 200
+                dedup = JobDedupIndex()
+                watermark = watermark_for("jobs_page_paginated")
+                jobs = extract_iimjobs_feed_with_pagination(driver, max_jobs, scroll_pages, extraction_mode, dedup, watermark)
+                if found_any(jobs, watermark):
+                    return jobs_response(jobs, "jobs_page_paginated", commands.count, dedup, watermark)
                 
-        except Exception as e:
-            print(f"Jobs page access failed: {str(e)}")
+            except Exception as e:
+                print(f"Jobs page access failed: {str(e)}")
         
-        # Method 3: Try search page with pagination
-        try:
-            driver.get("https://www.iimjobs.com/j")  # Common job search URL pattern
-            time.sleep(5)
+            # Method 3: Try search page with pagination
+            try:
+                # Common job search URL pattern
+                navigate(driver, f"{IIMJOBS_BASE_URL}/j", "job_feed", ready_selector=FEED_READY_SELECTOR)
             
-            jobs = extract_iimjobs_feed_with_pagination(driver, max_jobs, scroll_pages)
-            if jobs:
-                return jsonify({"jobs": jobs, "count": len(jobs), "method": "search_page_paginated"}), 200
+                dedup = JobDedupIndex()
+                watermark = watermark_for("search_page_paginated")
+                jobs = extract_iimjobs_feed_with_pagination(driver, max_jobs, scroll_pages, extraction_mode, dedup, watermark)
+                if found_any(jobs, watermark):
+                    return jobs_response(jobs, "search_page_paginated", commands.count, dedup, watermark)
                 
-        except Exception as e:
-            print(f"Search page access failed: {str(e)}")
+            except Exception as e:
+                print(f"Search page access failed: {str(e)}")
         
-        # Method 4: Try multiple job categories/searches
-        try:
-            jobs = scrape_multiple_job_categories(driver, max_jobs)
-            if jobs:
-                return jsonify({"jobs": jobs, "count": len(jobs), "method": "multiple_categories"}), 200
+            # Method 4: Try multiple job categories/searches
+            try:
+                dedup = JobDedupIndex()
+                jobs = scrape_multiple_job_categories(driver, max_jobs, extraction_mode, dedup, category_concurrency)
+                if jobs:
+                    watermark = watermark_for("multiple_categories")
+                    if watermark is not None:
+                        jobs = watermark.filter(jobs)
+                    return jobs_response(jobs, "multiple_categories", commands.count, dedup, watermark)
                 
-        except Exception as e:
-            print(f"Multiple categories method failed: {str(e)}")
+            except Exception as e:
+                print(f"Multiple categories method failed: {str(e)}")
         
-        # If no jobs found, provide detailed debug info
-        driver.save_screenshot("iimjobs_debug.png")
+            # If no jobs found, provide detailed debug info
+            driver.save_screenshot("iimjobs_debug.png")
         
-        return jsonify({
-            "error": "No job listings found",
-            "debug_info": {
-                "current_url": driver.current_url,
-                "page_title": driver.title,
-                "screenshot_saved": "iimjobs_debug.png"
-            },
-            "suggestion": "Try checking if login is required or if the page structure has changed"
-        }), 404
+            return jsonify({
+                "error": "No job listings found",
+                "debug_info": {
+                    "current_url": driver.current_url,
+                    "page_title": driver.title,
+                    "screenshot_saved": "iimjobs_debug.png"
+                },
+                "suggestion": "Try checking if login is required or if the page structure has changed"
+            }), 404
 
     except Exception as e:
         return jsonify({"error": f"Job fetching failed: {str(e)}"}), 500
 
-def extract_iimjobs_feed_with_pagination(driver, max_jobs=100, scroll_pages=5):
+job_store = JobStore(JOB_STORE_PATH)
+
+def store_jobs(jobs):
+    """Write scraped jobs to the local store; {"inserted", "changed"}, or None when disabled or failed"""
+    if not JOB_STORE_ENABLED or not jobs:
+        return None
+    try:
+        inserted, changed = job_store.save(jobs)
+    except Exception as e:
+        print(f"Job store write failed: {str(e)}")
+        return None
+    return {"inserted": inserted, "changed": changed}
+
+@app.route("/api/jobs/search", methods=["GET"])
+def search_jobs():
+    """Filtered, paginated jobs from the local store; needs no session or browser"""
+    args = request.args
+    limit = min(max(args.get("limit", 20, type=int), 1), JOB_SEARCH_MAX_LIMIT)
+    offset = max(args.get("offset", 0, type=int), 0)
+    posted_since = args.get("posted_since")
+    if posted_since and not re.match(r'^\d{4}-\d{2}-\d{2}$', posted_since):
+        return jsonify({"error": "posted_since must be a YYYY-MM-DD date"}), 400
+
+    started = time.perf_counter()
+    try:
+        result = job_store.search(
+            q=args.get("q"),
+            company=args.get("company"),
+            location=args.get("location"),
+            job_id=args.get("job_id"),
+            posted_since=posted_since,
+            seen_since=args.get("seen_since", type=float),
+            limit=limit,
+            offset=offset
+        )
+    except Exception as e:
+        return jsonify({"error": f"Job search failed: {str(e)}"}), 500
+
+    result["count"] = len(result["jobs"])
+    result["query_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return jsonify(result), 200
+
+def format_stream_event(event, stream_format):
+    if stream_format == "sse":
+        return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    return json.dumps(event) + "\n"
+
+@app.route("/api/jobs/stream", methods=["POST"])
+def stream_jobs():
+    """Same as /api/jobs, but streams each job as NDJSON records or server-sent events as soon as it is extracted"""
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    session_id = data.get("session_id")
+    max_jobs = data.get("max_jobs", 100)
+    scroll_pages = data.get("scroll_pages", 5)
+    extraction_mode = data.get("extraction_mode", EXTRACTION_MODE)
+    category_concurrency = data.get("category_concurrency", CATEGORY_CONCURRENCY)
+    light = data.get("light", False)
+    stream_format = data.get("format", "ndjson")  # "ndjson" or "sse"
+
+    if not session_id or session_id not in sessions:
+        return jsonify({"error": "Invalid session. Please login first."}), 403
+    if extraction_mode not in EXTRACTION_MODES:
+        return jsonify({"error": f"extraction_mode must be one of: {', '.join(EXTRACTION_MODES)}"}), 400
+    if not isinstance(category_concurrency, int) or category_concurrency < 1:
+        return jsonify({"error": "category_concurrency must be a positive integer"}), 400
+    if stream_format not in ("ndjson", "sse"):
+        return jsonify({"error": "format must be 'ndjson' or 'sse'"}), 400
+    profile = browser_profile_for("stream_jobs", data)
+    if profile not in BROWSER_PROFILES:
+        return jsonify({"error": f"browser_profile must be one of: {', '.join(BROWSER_PROFILES)}"}), 400
+
+    session_data = sessions[session_id]
+    driver = session_data["driver"]
+
+    def generate():
+        started = time.perf_counter()
+        count = 0
+        pending = []  # sent but not yet stored
+        stored = {"inserted": 0, "changed": 0}
+        method = None
+        dedup = JobDedupIndex()
+
+        def store_pending():
+            result = store_jobs(pending)
+            if result:
+                stored["inserted"] += result["inserted"]
+                stored["changed"] += result["changed"]
+            pending.clear()
+
+        def sent(job):
+            pending.append(job)
+            if len(pending) >= STREAM_STORE_BATCH:
+                store_pending()
+
+        def event(event_type, **fields):
+            return format_stream_event({"type": event_type, **fields}, stream_format)
+
+        try:
+            # The response body runs after the view returns, so the session turn is taken here
+            with session_turn(session_id), CommandCounter(driver) as commands:
+                apply_browser_profile(driver, profile)
+                if light:
+                    yield event("progress", stage="light_fetch")
+                    jobs, method = fetch_jobs_light(session_data, max_jobs, dedup)
+                    for job in jobs:
+                        count += 1
+                        sent(job)
+                        yield event("job", job=job)
+
+                sources = [
+                    ("direct_jobfeed_paginated", f"{IIMJOBS_BASE_URL}/jobfeed"),
+                    ("jobs_page_paginated", f"{IIMJOBS_BASE_URL}/jobs"),
+                    ("search_page_paginated", f"{IIMJOBS_BASE_URL}/j")
+                ]
+                for source_method, url in sources:
+                    if count:
+                        break
+                    yield event("progress", stage="navigate", method=source_method, url=url)
+                    try:
+                        navigate(driver, url, "job_feed", ready_selector=FEED_READY_SELECTOR)
+                        dedup = JobDedupIndex()
+                        for kind, payload in iter_iimjobs_feed_pages(driver, max_jobs, scroll_pages, extraction_mode, dedup):
+                            if kind == "job":
+                                count += 1
+                                sent(payload)
+                                yield event("job", job=payload)
+                            else:
+                                store_pending()
+                                yield event("progress", stage="page", method=source_method, **payload)
+                        if count:
+                            method = source_method
+                    except Exception as e:
+                        print(f"Streaming from {url} failed: {str(e)}")
+                        yield event("progress", stage="failed", method=source_method, error=str(e))
+
+                if not count:
+                    yield event("progress", stage="navigate", method="multiple_categories")
+                    dedup = JobDedupIndex()
+                    for job in scrape_multiple_job_categories(driver, max_jobs, extraction_mode, dedup, category_concurrency):
+                        count += 1
+                        sent(job)
+                        yield event("job", job=job)
+                    if count:
+                        method = "multiple_categories"
+
+                store_pending()
+                yield event(
+                    "summary",
+                    count=count,
+                    method=method,
+                    extraction_mode=extraction_mode,
+                    elapsed_seconds=round(time.perf_counter() - started, 3),
+                    webdriver_round_trips=commands.count,
+                    deduplication=dedup.summary(),
+                    store=stored if JOB_STORE_ENABLED and count else None,
+                    error=None if count else "No job listings found"
+                )
+        except SessionBusy as e:
+            yield event("error", error=f"{str(e)}; other requests for this session are still running")
+        except Exception as e:
+            yield event("error", error=f"Job fetching failed: {str(e)}")
+
+    mimetype = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def extract_iimjobs_feed_with_pagination(driver, max_jobs=100, scroll_pages=5, extraction_mode=None, dedup=None, watermark=None):
     """Extract jobs with pagination/scrolling support"""
+    print(f"Extracting jobs with pagination... Target: {max_jobs}, Scroll pages: {scroll_pages}")
+    
     jobs = []
+    for kind, payload in iter_iimjobs_feed_pages(driver, max_jobs, scroll_pages, extraction_mode, dedup, watermark):
+        task_manager.report(kind, payload)
+        if kind == "job":
+            jobs.append(payload)
     
-    print(f"Extracting jobs with pagination... Target: {max_jobs}, Scroll pages: {scroll_pages}")
+    print(f"Total jobs extracted with pagination: {len(jobs)}")
+    return jobs[:max_jobs]  # Return only the requested number
+
+def iter_iimjobs_feed_pages(driver, max_jobs=100, scroll_pages=5, extraction_mode=None, dedup=None, watermark=None):
+    """Yield ("job", job) for each new job as soon as it is extracted, and ("page", progress) after each page.
+    With a watermark, jobs the user already has are skipped and scrolling stops after a run of them"""
+    extraction_mode = extraction_mode or EXTRACTION_MODE
+    dedup = dedup if dedup is not None else JobDedupIndex()
+    run_token = uuid.uuid4().hex  # marks the cards this run has already extracted
+    total = 0
     
     for page in range(scroll_pages):
         print(f"Processing page/scroll {page + 1}")
         
-        # Wait for content to load
-        time.sleep(3)
+        if extraction_mode == "snapshot":
+            # Parse this page's snapshot in a worker while the browser moves on to the next page;
+            # cards extracted from earlier snapshots are skipped before the limit applies
+            parse = submit_snapshot_parse(driver, max_jobs - total, dedup.identities())
+            has_more = page + 1 < scroll_pages and scroll_or_next_page(driver)
+            page_jobs = parse.result()
+        else:
+            # Extract only the cards added since the previous pass
+            page_jobs = iter_iimjobs_feed(driver, max_jobs - total, extraction_mode, run_token, settle=page == 0)
+            has_more = None
         
-        # Extract jobs from current page
-        current_jobs = extract_iimjobs_feed(driver, max_jobs - len(jobs))
+        # Remove duplicates by job id, or normalized title and company
+        found = added = known = 0
+        for job in page_jobs:
+            found += 1
+            if not dedup.add(job):
+                continue
+            if watermark is not None and not watermark.is_new_or_changed(job):
+                known += 1
+                continue
+            added += 1
+            total += 1
+            yield "job", job
         
-        if current_jobs:
-            # Remove duplicates based on job title and company
-            for job in current_jobs:
-                is_duplicate = False
-                for existing_job in jobs:
-                    if (job.get("title") == existing_job.get("title") and 
-                        job.get("company") == existing_job.get("company")):
-                        is_duplicate = True
-                        break
-                
-                if not is_duplicate:
-                    jobs.append(job)
-            
-            print(f"Found {len(current_jobs)} jobs on page {page + 1}, Total: {len(jobs)}")
+        unique = added + known
+        if found:
+            dedup.record_page(page + 1, found, unique)
+            print(f"Found {found} jobs on page {page + 1} ({found - unique} duplicates, {known} already known), Total: {total}")
+        yield "page", {"page": page + 1, "found": found, "added": added, "known": known, "duplicates": found - unique, "total": total}
         
         # Break if we have enough jobs
-        if len(jobs) >= max_jobs:
+        if total >= max_jobs:
+            break
+        if watermark is not None and watermark.should_stop:
+            print(f"Reached {watermark.known_run} already known jobs in a row, stopping")
             break
         
         # Try to scroll down or go to next page
-        if not scroll_or_next_page(driver):
+        if has_more is None:
+            card_selector = selector_registry.learned_selector(selector_page_type(driver.current_url))
+            has_more = scroll_or_next_page(driver, card_selector)
+        if not has_more:
             print("No more pages or scrolling failed")
             break
-    
-    print(f"Total jobs extracted with pagination: {len(jobs)}")
-    return jobs[:max_jobs]  # Return only the requested number
 
-def scroll_or_next_page(driver):
-    """Try to scroll down or navigate to next page"""
+@phase_timings.timed("scroll")
+def scroll_or_next_page(driver, card_selector=None):
+    """Try to scroll down or navigate to next page. With card_selector, an infinite-scroll
+    step ends as soon as more cards match it, instead of waiting for the page to grow"""
+    from selenium.webdriver.common.by import By
+
     try:
         # Method 1: Try to find and click "Next" button
         next_selectors = [
@@ -225,22 +1565,31 @@ def scroll_or_next_page(driver):
                 
                 if next_button.is_enabled() and next_button.is_displayed():
                     driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(3)
+                    wait_for_network_quiet(driver)
                     return True
             except:
                 continue
         
         # Method 2: Try infinite scroll
-        last_height = driver.execute_script("return document.body.scrollHeight")
+        last_height, last_count = driver.execute_script(
+            "return [document.body.scrollHeight, arguments[0] ? document.querySelectorAll(arguments[0]).length : 0];",
+            card_selector
+        )
         
         # Scroll down to bottom
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(3)
         
         # Check if more content loaded
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        
-        if new_height > last_height:
+        if card_selector:
+            if wait_until(
+                driver,
+                lambda d: d.execute_script(COUNT_MATCHES_JS, card_selector) > last_count,
+                SCROLL_NEW_CARDS_TIMEOUT,
+                "new_cards"
+            ):
+                return True
+        elif wait_for_height_growth(driver, last_height, timeout=SCROLL_NEW_CARDS_TIMEOUT):
+            wait_for_network_quiet(driver, timeout=5)
             return True
         
         # Method 3: Try loading more content with JavaScript
@@ -261,7 +1610,8 @@ def scroll_or_next_page(driver):
                 
                 if load_button.is_enabled() and load_button.is_displayed():
                     driver.execute_script("arguments[0].click();", load_button)
-                    time.sleep(3)
+                    wait_for_height_growth(driver, last_height)
+                    wait_for_network_quiet(driver, timeout=5)
                     return True
             except:
                 continue
@@ -272,9 +1622,19 @@ def scroll_or_next_page(driver):
         print(f"Scroll/pagination error: {str(e)}")
         return False
 
-def scrape_multiple_job_categories(driver, max_jobs=100):
+def category_search_urls():
+    return [
+        f"{IIMJOBS_BASE_URL}/j?kw=finance",
+        f"{IIMJOBS_BASE_URL}/j?kw=marketing",
+        f"{IIMJOBS_BASE_URL}/j?kw=sales",
+        f"{IIMJOBS_BASE_URL}/j?kw=manager",
+        f"{IIMJOBS_BASE_URL}/j?kw=analyst"
+    ]
+
+def scrape_multiple_job_categories(driver, max_jobs=100, extraction_mode=None, dedup=None, concurrency=None):
     """Scrape jobs from multiple categories/searches"""
     jobs = []
+    dedup = dedup if dedup is not None else JobDedupIndex()
     
     # Common job search terms and categories
     search_terms = [
@@ -283,13 +1643,11 @@ def scrape_multiple_job_categories(driver, max_jobs=100):
     ]
     
     # Try different search URLs
-    search_urls = [
-        "https://www.iimjobs.com/j?kw=finance",
-        "https://www.iimjobs.com/j?kw=marketing", 
-        "https://www.iimjobs.com/j?kw=sales",
-        "https://www.iimjobs.com/j?kw=manager",
-        "https://www.iimjobs.com/j?kw=analyst"
-    ]
+    search_urls = category_search_urls()
+    
+    concurrency = min(CATEGORY_CONCURRENCY if concurrency is None else concurrency, len(search_urls))
+    if concurrency > 1:
+        return scrape_categories_in_parallel(driver, search_urls, max_jobs, extraction_mode, dedup, concurrency)
     
     for i, url in enumerate(search_urls):
         if len(jobs) >= max_jobs:
@@ -297,25 +1655,16 @@ def scrape_multiple_job_categories(driver, max_jobs=100):
             
         try:
             print(f"Scraping category {i+1}: {url}")
-            driver.get(url)
-            time.sleep(4)
+            navigate(driver, url, "category_search", ready_selector=FEED_READY_SELECTOR)
             
-            category_jobs = extract_iimjobs_feed(driver, max_jobs - len(jobs))
+            category_jobs = extract_iimjobs_feed(driver, max_jobs - len(jobs), extraction_mode)
             
             if category_jobs:
                 # Remove duplicates
-                for job in category_jobs:
-                    is_duplicate = False
-                    for existing_job in jobs:
-                        if (job.get("title") == existing_job.get("title") and 
-                            job.get("company") == existing_job.get("company")):
-                            is_duplicate = True
-                            break
-                    
-                    if not is_duplicate:
-                        jobs.append(job)
+                new_jobs = dedup.add_page(category_jobs, url)
+                jobs.extend(new_jobs)
                 
-                print(f"Added {len(category_jobs)} jobs from category, Total: {len(jobs)}")
+                print(f"Added {len(new_jobs)} of {len(category_jobs)} jobs from category, Total: {len(jobs)}")
         
         except Exception as e:
             print(f"Error scraping category {url}: {str(e)}")
@@ -323,100 +1672,431 @@ def scrape_multiple_job_categories(driver, max_jobs=100):
     
     return jobs[:max_jobs]
 
-def extract_iimjobs_feed(driver, max_jobs=50):
-    """Extract jobs specifically from IIMJobs feed format"""
+def clone_session_driver(driver):
+    """A new driver carrying the logged-in session's cookies. It is launched rather than
+    taken from the warm pool, which is kept for logins, and its commands also count
+    toward every CommandCounter active on driver"""
+    counters = list(vars(driver).get("command_counters", []))
+    cookies = driver.get_cookies()
+    clone = launch_instrumented_driver()
+    execute = clone.execute
+
+    def counted_execute(driver_command, params=None):
+        for counter in counters:
+            counter.add()
+        return execute(driver_command, params)
+
+    clone.execute = counted_execute
+    if getattr(driver, "browser_profile", None):
+        apply_browser_profile(clone, driver.browser_profile)
+
+    try:
+        # Network.setCookies needs no navigation; fall back to add_cookie on the site itself
+        try:
+            clone.execute_cdp_cmd("Network.setCookies", {"cookies": [
+                {
+                    "name": cookie["name"],
+                    "value": cookie["value"],
+                    "domain": cookie.get("domain", urlparse(IIMJOBS_BASE_URL).hostname),
+                    "path": cookie.get("path", "/"),
+                    "secure": cookie.get("secure", False),
+                    "httpOnly": cookie.get("httpOnly", False),
+                    **({"expires": cookie["expiry"]} if "expiry" in cookie else {}),
+                    **({"sameSite": cookie["sameSite"]} if "sameSite" in cookie else {})
+                }
+                for cookie in cookies
+            ]})
+        except Exception:
+            clone.get(f"{IIMJOBS_BASE_URL}/")
+            for cookie in cookies:
+                try:
+                    clone.add_cookie(cookie)
+                except:
+                    continue
+    except Exception:
+        quit_driver(clone)
+        raise
+
+    return clone
+
+def scrape_categories_in_parallel(driver, search_urls, max_jobs, extraction_mode, dedup, concurrency):
+    """Scrape search_urls with the session driver plus concurrency - 1 cookie-cloned drivers"""
     jobs = []
-    
-    print(f"Extracting jobs from IIMJobs feed... Max: {max_jobs}")
-    
-    # Wait a bit more for dynamic content to load
-    time.sleep(3)
-    
-    # Extended list of job selectors
-    job_selectors = [
-        # IIMJobs specific selectors
-        "[data-job-id]",
-        ".job-item",
-        ".job-card", 
-        ".feed-item",
-        ".job-listing",
-        ".job-row",
-        ".job-tile",
-        ".job-container",
-        # Generic selectors
-        "div[class*='job']",
-        "li[class*='job']",
-        "div[class*='listing']",
-        "div[class*='card']",
-        ".card",
-        # More specific patterns
-        "div:has(img[src*='logo'])",
-        "div:has(a[href*='job'])",
-        "div:has(a[href*='view'])",
-        # Table-based layouts
-        "tr[class*='job']",
-        "tbody tr"
-    ]
-    
-    job_containers = []
-    
-    for selector in job_selectors:
+    lock = threading.Lock()
+    enough_jobs = threading.Event()
+    pending_urls = queue.Queue()
+    for url in search_urls:
+        pending_urls.put(url)
+
+    print(f"Scraping {len(search_urls)} categories with {concurrency} browsers")
+
+    def scrape_with(worker_driver):
+        while not enough_jobs.is_set():
+            try:
+                url = pending_urls.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                print(f"Scraping category: {url}")
+                navigate(worker_driver, url, "category_search", ready_selector=FEED_READY_SELECTOR)
+
+                with lock:
+                    remaining = max_jobs - len(jobs)
+                if remaining <= 0:
+                    enough_jobs.set()
+                    return
+
+                category_jobs = extract_iimjobs_feed(worker_driver, remaining, extraction_mode)
+
+                with lock:
+                    new_jobs = dedup.add_page(category_jobs, url)
+                    jobs.extend(new_jobs)
+                    print(f"Added {len(new_jobs)} of {len(category_jobs)} jobs from category, Total: {len(jobs)}")
+                    if len(jobs) >= max_jobs:
+                        enough_jobs.set()
+            except Exception as e:
+                print(f"Error scraping category {url}: {str(e)}")
+
+    trace = phase_timings.current()
+
+    def clone_and_scrape():
+        # Clone threads count toward the request that started them, not "background"
+        with phase_timings.adopt(trace):
+            try:
+                clone = clone_session_driver(driver)
+            except Exception as e:
+                print(f"Could not start a category browser: {str(e)}")
+                return
+            try:
+                scrape_with(clone)
+            finally:
+                quit_driver(clone)
+
+    workers = [threading.Thread(target=clone_and_scrape, daemon=True) for _ in range(concurrency - 1)]
+    for worker in workers:
+        worker.start()
+    scrape_with(driver)
+    for worker in workers:
+        worker.join()
+
+    return jobs[:max_jobs]
+
+def extract_iimjobs_feed(driver, max_jobs=50, extraction_mode=None):
+    """Extract jobs specifically from IIMJobs feed format"""
+    return list(iter_iimjobs_feed(driver, max_jobs, extraction_mode))
+
+def selector_page_type(url):
+    """Page type the selector registry learns separately: jobfeed, jobs, keyword_search, search, category or other"""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/")
+    if path.endswith("/jobfeed"):
+        return "jobfeed"
+    if path.endswith("/jobs"):
+        return "jobs"
+    if path.endswith("/j"):
+        return "keyword_search" if "kw=" in parsed.query else "search"
+    if "-jobs" in path or path.startswith("/c/"):
+        return "category"
+    return "other"
+
+class SelectorRegistry:
+    """Remembers which container selector matched on each page type and tries it first next time.
+
+    A miss on the learned selector falls back to the full list in order and
+    relearns; per-selector hit rates and timings show when the layout changes.
+    """
+
+    def __init__(self, selectors, min_matches=2):
+        self.selectors = list(selectors)
+        self.min_matches = min_matches
+        self._learned = {}  # page_type -> selector
+        self._lock = threading.Lock()
+        self.selector_stats = {}
+        self.page_stats = {}
+
+    def _record(self, selector, hit, seconds):
+        with self._lock:
+            entry = self.selector_stats.setdefault(selector, {"tries": 0, "hits": 0, "total_ms": 0.0})
+            entry["tries"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + seconds * 1000, 1)
+            if hit:
+                entry["hits"] += 1
+
+    def _count(self, page_type, key):
+        with self._lock:
+            entry = self.page_stats.setdefault(page_type, {
+                "learned_hits": 0,
+                "learned_misses": 0,
+                "full_scans": 0,
+                "not_found": 0
+            })
+            entry[key] += 1
+
+    def _try(self, driver, selector):
+        from selenium.webdriver.common.by import By
+
+        started = time.perf_counter()
         try:
             elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            if elements and len(elements) > 1:  # We want multiple job listings
-                print(f"Found {len(elements)} potential job containers with selector: {selector}")
-                job_containers = elements
-                break
         except Exception as e:
             print(f"Selector {selector} failed: {str(e)}")
-            continue
+            elements = []
+        hit = len(elements) >= self.min_matches  # We want multiple job listings
+        self._record(selector, hit, time.perf_counter() - started)
+        return elements if hit else None
+
+    def find_containers(self, driver, page_type):
+        """(elements, selector) for the first selector matching several elements, or ([], None)"""
+        with self._lock:
+            learned = self._learned.get(page_type)
+
+        if learned:
+            elements = self._try(driver, learned)
+            if elements:
+                self._count(page_type, "learned_hits")
+                return elements, learned
+            self._count(page_type, "learned_misses")
+            print(f"Learned selector {learned} no longer matches on {page_type} pages, rescanning")
+
+        self._count(page_type, "full_scans")
+        for selector in self.selectors:
+            if selector == learned:
+                continue
+            elements = self._try(driver, selector)
+            if elements:
+                with self._lock:
+                    self._learned[page_type] = selector
+                return elements, selector
+
+        with self._lock:
+            self._learned.pop(page_type, None)
+        self._count(page_type, "not_found")
+        return [], None
+
+    def learned_selector(self, page_type):
+        with self._lock:
+            return self._learned.get(page_type)
+
+    def snapshot(self):
+        with self._lock:
+            selectors = {
+                selector: dict(
+                    entry,
+                    hit_rate=round(entry["hits"] / entry["tries"], 3),
+                    avg_ms=round(entry["total_ms"] / entry["tries"], 1)
+                )
+                for selector, entry in self.selector_stats.items()
+            }
+            return {
+                "learned": dict(self._learned),
+                "pages": {page_type: dict(entry) for page_type, entry in self.page_stats.items()},
+                "selectors": selectors
+            }
+
+selector_registry = SelectorRegistry(JOB_CONTAINER_SELECTORS)
+
+# Incremental scrolling: each run tags the cards it has extracted with its own
+# token, so a pass after a scroll only reads the cards added since the last one.
+# A card is marked only once it has produced a job, so cards that were still rendering
+# (too little text) or failed to extract are tried again on the next pass
+SEEN_CARD_ATTRIBUTE = "data-iimjobs-seen"
+UNCLAIMED_CARDS_JS = """
+var containers = arguments[0], attr = arguments[1], token = arguments[2];
+return containers.filter(function (el) { return el.getAttribute(attr) !== token; });
+"""
+CLAIM_CARDS_JS = """
+var containers = arguments[0], attr = arguments[1], token = arguments[2];
+containers.forEach(function (el) { el.setAttribute(attr, token); });
+"""
+COUNT_MATCHES_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+def iter_iimjobs_feed(driver, max_jobs=50, extraction_mode=None, run_token=None, settle=True):
+    """Yield jobs from the current page as soon as each one is extracted; with run_token,
+    only cards not already extracted under that token. settle=False skips the wait for
+    dynamic content, for scroll passes that already waited for their new cards"""
+    extraction_mode = extraction_mode or EXTRACTION_MODE
     
-    # If specific selectors don't work, try a more generic approach
-    if not job_containers:
-        print("Trying generic approach to find job listings...")
-        
-        # Look for elements containing job-related keywords
-        job_keywords = ["hiring", "experience", "years", "salary", "apply", "job", "position", "role"]
+    print(f"Extracting jobs from IIMJobs feed... Max: {max_jobs}, Mode: {extraction_mode}")
+    
+    # Let dynamic content finish loading
+    if settle:
+        wait_for_network_quiet(driver, timeout=5)
+    
+    if extraction_mode == "snapshot":
+        with phase_timings.phase("snapshot_parse"):
+            jobs = submit_snapshot_parse(driver, max_jobs).result()
+        print(f"Total jobs extracted from snapshot: {len(jobs)}")
+        yield from jobs
+        return
+    
+    with phase_timings.phase("find_containers"):
+        job_containers, selector = selector_registry.find_containers(driver, selector_page_type(driver.current_url))
+        if selector:
+            print(f"Found {len(job_containers)} potential job containers with selector: {selector}")
+    
+        # If specific selectors don't work, try a more generic approach
+        if not job_containers:
+            print("Trying generic approach to find job listings...")
         
-        try:
-            # Find divs that contain multiple job-related keywords
-            all_divs = driver.find_elements(By.TAG_NAME, "div")
-            potential_containers = []
-            
-            for div in all_divs:
-                text = div.text.lower()
-                keyword_count = sum(1 for keyword in job_keywords if keyword in text)
-                
-                if keyword_count >= 2 and len(text) > 50:  # At least 2 keywords and substantial text
-                    potential_containers.append(div)
+            try:
+                # Divs with at least 2 job keywords and substantial text, scored in one in-page call
+                potential_containers = driver.execute_script(SCORE_CONTAINERS_JS, JOB_KEYWORDS, max_jobs * 2, 2, 50) or []
             
-            if len(potential_containers) > 3:
-                job_containers = potential_containers[:max_jobs * 2]  # Take more than needed
-                print(f"Found {len(job_containers)} job containers using keyword approach")
-        except:
-            pass
+                if len(potential_containers) > 3:
+                    job_containers = potential_containers
+                    print(f"Found {len(job_containers)} job containers using keyword approach")
+            except Exception as e:
+                print(f"Keyword container search failed: {str(e)}")
     
-    # Extract job data from containers
-    extracted_count = 0
-    for i, container in enumerate(job_containers):
-        if extracted_count >= max_jobs:
-            break
-            
+    if run_token and job_containers:
+        seen = len(job_containers)
+        job_containers = driver.execute_script(UNCLAIMED_CARDS_JS, job_containers, SEEN_CARD_ATTRIBUTE, run_token)
+        print(f"{len(job_containers)} containers left to extract ({seen - len(job_containers)} already extracted)")
+    
+    with CommandCounter(driver) as extraction_commands:
+        # In script mode every container is read by one in-page call
+        card_data = None
+        if extraction_mode == "script" and job_containers:
+            with phase_timings.phase("collect_cards"):
+                card_data = collect_cards_in_browser(driver, job_containers)
+    
+        # Extract job data from containers
+        extracted_count = 0
+        extracted_containers = []
         try:
-            job_data = extract_iimjobs_job_data(container, driver)
-            if job_data:
-                jobs.append(job_data)
-                extracted_count += 1
-                print(f"Extracted job {extracted_count}: {job_data.get('title', 'No title')} at {job_data.get('company', 'No company')}")
-        except Exception as e:
-            print(f"Error extracting job {i}: {str(e)}")
-            continue
+            for i, container in enumerate(job_containers):
+                if extracted_count >= max_jobs:
+                    break
+                
+                try:
+                    with phase_timings.phase("extract_card"):
+                        if card_data is not None:
+                            job_data = build_job_data(card_data[i])
+                        else:
+                            job_data = extract_iimjobs_job_data(container, driver)
+                except Exception as e:
+                    print(f"Error extracting job {i}: {str(e)}")
+                    continue
+                
+                if job_data:
+                    extracted_count += 1
+                    extracted_containers.append(container)
+                    print(f"Extracted job {extracted_count}: {job_data.get('title', 'No title')} at {job_data.get('company', 'No company')}")
+                    yield job_data
+        finally:
+            if run_token and extracted_containers:
+                try:
+                    driver.execute_script(CLAIM_CARDS_JS, extracted_containers, SEEN_CARD_ATTRIBUTE, run_token)
+                except Exception as e:
+                    print(f"Could not mark extracted cards: {str(e)}")
     
-    print(f"Total jobs extracted: {len(jobs)}")
-    return jobs
+    print(f"Total jobs extracted: {extracted_count} using {extraction_commands.count} WebDriver round trips for {len(job_containers)} containers")
+
+# Keyword fallback for pages no container selector matches. Scores every div by
+# job keyword count, keeps the innermost of nested candidates (an outer wrapper
+# repeats its cards' text) and returns the best `limit` as element handles in
+# document order.
+SCORE_CONTAINERS_JS = """
+var keywords = arguments[0], limit = arguments[1], minKeywords = arguments[2], minLength = arguments[3];
+var divs = document.getElementsByTagName('div');
+var candidates = [];
+
+for (var i = 0; i < divs.length; i++) {
+    var text = (divs[i].innerText || '').toLowerCase();
+    if (text.length <= minLength) {
+        continue;
+    }
+    var score = 0;
+    for (var k = 0; k < keywords.length; k++) {
+        if (text.indexOf(keywords[k]) !== -1) {
+            score++;
+        }
+    }
+    if (score >= minKeywords) {
+        candidates.push({el: divs[i], score: score, length: text.length, order: candidates.length});
+    }
+}
+
+var isCandidate = new Set(candidates.map(function (c) { return c.el; }));
+var wrappers = new Set();
+candidates.forEach(function (c) {
+    for (var parent = c.el.parentElement; parent; parent = parent.parentElement) {
+        if (isCandidate.has(parent)) {
+            wrappers.add(parent);
+        }
+    }
+});
+
+return candidates
+    .filter(function (c) { return !wrappers.has(c.el); })
+    .sort(function (a, b) { return b.score - a.score || a.length - b.length; })
+    .slice(0, limit)
+    .sort(function (a, b) { return a.order - b.order; })
+    .map(function (c) { return c.el; });
+"""
+
+# Reads every container in one round trip, applying the same company/title
+# selector rules as extract_iimjobs_job_data; Python post-processes the result.
+EXTRACT_CARDS_JS = """
+var containers = arguments[0], companySelectors = arguments[1], titleSelectors = arguments[2];
+
+function firstText(container, selector) {
+    try {
+        var elem = container.querySelector(selector);
+        return elem ? (elem.innerText || '').trim() : null;
+    } catch (err) {
+        return null;
+    }
+}
+
+return containers.map(function (container) {
+    var card = {text: (container.innerText || '').trim(), company: null, title: null,
+                href: null, has_img: false, logo: null};
+    if (card.text.length < 20) {
+        return card;
+    }
+
+    for (var i = 0; i < companySelectors.length; i++) {
+        var company = firstText(container, companySelectors[i]);
+        if (company && company.length > 1 && company.length < 100) {
+            card.company = company;
+            break;
+        }
+    }
+    for (var j = 0; j < titleSelectors.length; j++) {
+        var title = firstText(container, titleSelectors[j]);
+        if (title && title !== card.company && title.length > 3) {
+            card.title = title;
+            break;
+        }
+    }
+
+    var link = container.querySelector('a');
+    if (link && link.hasAttribute('href')) {
+        card.href = link.href;
+    }
+    var img = container.querySelector('img');
+    if (img) {
+        card.has_img = true;
+        card.logo = img.hasAttribute('src') ? img.src : null;
+    }
+    return card;
+});
+"""
+
+def collect_cards_in_browser(driver, containers):
+    """Raw card dicts for all containers from a single execute_script, or None if the script fails"""
+    try:
+        return driver.execute_script(EXTRACT_CARDS_JS, containers, COMPANY_SELECTORS, TITLE_SELECTORS)
+    except Exception as e:
+        print(f"In-browser card extraction failed, using per-element extraction: {str(e)}")
+        return None
 
 def extract_iimjobs_job_data(container, driver):
     """Extract job data specifically for IIMJobs format"""
+    from selenium.webdriver.common.by import By
+
     job_data = {}
     
     try:
@@ -426,11 +2106,7 @@ def extract_iimjobs_job_data(container, driver):
             return None
         
         # company
-        company_selectors = [
-            "h3", "h4", "h2", ".company", ".company-name", "[data-company]",
-            "strong", "b", ".employer", ".org-name"
-        ]
-        for selector in company_selectors:
+        for selector in COMPANY_SELECTORS:
             try:
                 elem = container.find_element(By.CSS_SELECTOR, selector)
                 text = elem.text.strip()
@@ -441,11 +2117,7 @@ def extract_iimjobs_job_data(container, driver):
                 continue
         
         # title
-        title_selectors = [
-            "h1", "h2", "h3", "h4", "h5", ".title", ".job-title", ".position",
-            "a[href*='job']", "a[href*='view']", ".role", ".designation"
-        ]
-        for selector in title_selectors:
+        for selector in TITLE_SELECTORS:
             try:
                 elem = container.find_element(By.CSS_SELECTOR, selector)
                 text = elem.text.strip()
@@ -455,90 +2127,20 @@ def extract_iimjobs_job_data(container, driver):
             except:
                 continue
         
-        # experience
-        experience_patterns = [
-            r'(\d+\s*-\s*\d+\s*[Yy]rs?)',
-            r'(\d+\+?\s*[Yy]rs?)',
-            r'(\d+\s*to\s*\d+\s*[Yy]ears?)',
-            r'(Fresher)',
-            r'(Entry\s*level)'
-        ]
-        for pattern in experience_patterns:
-            match = re.search(pattern, container_text, re.IGNORECASE)
-            if match:
-                job_data["experience"] = match.group(1)
-                break
-        
-        # location
-        location_keywords = [
-            "Hyderabad", "Bangalore", "Mumbai", "Delhi", "Chennai", "Pune", "Kolkata", 
-            "Gurgaon", "Noida", "Ahmedabad", "Jaipur", "Indore", "Bhopal", "Lucknow",
-            "Kochi", "Coimbatore", "Vadodara", "Nagpur", "Visakhapatnam", "Surat",
-            "Remote", "Work from home", "WFH"
-        ]
-        for location in location_keywords:
-            if location.lower() in container_text.lower():
-                job_data["location"] = location
-                break
-        
-        # salary
-        salary_patterns = [
-            r'(₹\s*\d+[,\d]*\s*-\s*₹?\s*\d+[,\d]*)',
-            r'(\d+\s*-\s*\d+\s*LPA)',
-            r'(\d+\s*-\s*\d+\s*Lakh)',
-            r'(Not\s*disclosed)',
-            r'(Salary\s*negotiable)'
-        ]
-        for pattern in salary_patterns:
-            match = re.search(pattern, container_text, re.IGNORECASE)
-            if match:
-                job_data["salary"] = match.group(1)
-                break
+        # experience, location, salary, posted date, job type
+        job_data.update(extract_text_fields(container_text))
         
         # link
         try:
             link_elem = container.find_element(By.TAG_NAME, "a")
-            href = link_elem.get_attribute("href")
-            if href:
-                if href.startswith("http"):
-                    job_data["link"] = href
-                elif href.startswith("/"):
-                    job_data["link"] = f"https://www.iimjobs.com{href}"
+            link = normalize_link(link_elem.get_attribute("href"))
+            if link:
+                job_data["link"] = link
         except:
             pass
         
-        # posted date
-        date_patterns = [
-            r'(posted\s+today)',
-            r'(posted\s+yesterday)',
-            r'(posted\s+\d+\s+days?\s+ago)',
-            r'(\d+\s+days?\s+ago)',
-            r'(few\s+hours?\s+ago)'
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, container_text.lower())
-            if match:
-                job_data["posted"] = match.group(1).title()
-                break
-        
-        # job type
-        job_type_keywords = ["Full-time", "Part-time", "Contract", "Permanent", "Temporary", "Internship"]
-        for job_type in job_type_keywords:
-            if job_type.lower() in container_text.lower():
-                job_data["job_type"] = job_type
-                break
-        
         # fallback from raw lines
-        if not job_data.get("title") and not job_data.get("company"):
-            lines = [line.strip() for line in container_text.split('\n') if line.strip()]
-            if lines:
-                for i, line in enumerate(lines[:5]):
-                    if len(line) > 5 and len(line) < 80:
-                        if not job_data.get("title"):
-                            job_data["title"] = line
-                        elif not job_data.get("company") and line != job_data["title"]:
-                            job_data["company"] = line
-                            break
+        apply_line_fallback(job_data, container_text)
 
         # LOGO
         try:
@@ -550,33 +2152,29 @@ def extract_iimjobs_job_data(container, driver):
             job_data["logo"] = ""
         
         # metadata
-        job_data["raw_text"] = container_text[:500] if container_text else ""
-        job_data["extraction_method"] = "enhanced_iimjobs"
-        
-        return job_data if (job_data.get("title") or job_data.get("company")) else None
+        return finalize_job_data(job_data, container_text)
         
     except Exception as e:
         print(f"Error in extract_iimjobs_job_data: {str(e)}")
         return None
 
 @app.route("/api/logout", methods=["POST"])
+@serialized_per_session
 def logout():
     data = request.json
     session_id = data.get("session_id")
     
-    if session_id in sessions:
-        try:
-            sessions[session_id]["driver"].quit()
-        except:
-            pass
-        del sessions[session_id]
+    if session_id and sessions.close(session_id, "logout"):
         return jsonify({"message": "Logged out successfully"}), 200
     
     return jsonify({"error": "Session not found"}), 404
 
 @app.route("/api/debug", methods=["POST"])
+@serialized_per_session
 def debug_page():
     """Debug endpoint to see current page content"""
+    from selenium.webdriver.common.by import By
+
     data = request.json
     session_id = data.get("session_id")
     
@@ -626,8 +2224,11 @@ def debug_page():
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/explore", methods=["POST"])
+@serialized_per_session
 def explore_site():
     """Explore the site structure to find job listings"""
+    from selenium.webdriver.common.by import By
+
     data = request.json
     session_id = data.get("session_id")
     
@@ -638,8 +2239,7 @@ def explore_site():
     
     try:
         # Start from homepage
-        driver.get("https://www.iimjobs.com")
-        time.sleep(3)
+        navigate(driver, IIMJOBS_BASE_URL, "home")
         
         # Find all navigation links
         nav_structure = {}
@@ -680,12 +2280,162 @@ def explore_site():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/browser-profiles/compare", methods=["POST"])
+@serialized_per_session
+def compare_browser_profiles():
+    """Load one page under each browser profile with the cache disabled and report bytes and load time"""
+    data = request.json
+    session_id = data.get("session_id")
+    url = data.get("url", f"{IIMJOBS_BASE_URL}/jobfeed")
+    profiles = data.get("profiles", list(BROWSER_PROFILES))
+    repeats = data.get("repeats", 1)
+
+    if not session_id or session_id not in sessions:
+        return jsonify({"error": "Invalid session. Please login first."}), 403
+    if not isinstance(repeats, int) or repeats < 1:
+        return jsonify({"error": "repeats must be a positive integer"}), 400
+    repeats = min(repeats, 5)
+    if not isinstance(profiles, list) or not all(isinstance(profile, str) for profile in profiles):
+        return jsonify({"error": "profiles must be a list of profile names"}), 400
+    unknown = [profile for profile in profiles if profile not in BROWSER_PROFILES]
+    if unknown:
+        return jsonify({"error": f"Unknown profiles: {', '.join(unknown)}"}), 400
+
+    driver = sessions[session_id]["driver"]
+    results = {}
+
+    try:
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        for profile in profiles:
+            apply_browser_profile(driver, profile)
+            runs = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                navigate(driver, url, "profile_compare")
+                runs.append(dict(page_load_metrics(driver) or {}, ready_seconds=round(time.perf_counter() - started, 3)))
+
+            results[profile] = {
+                "blocked_patterns": len(BROWSER_PROFILES[profile]),
+                "runs": runs,
+                "avg_ready_seconds": round(sum(run["ready_seconds"] for run in runs) / len(runs), 3),
+                "avg_transfer_bytes": round(sum(run.get("transfer_bytes") or 0 for run in runs) / len(runs))
+            }
+
+        return jsonify({"url": url, "repeats": repeats, "profiles": results}), 200
+
+    except Exception as e:
+        return jsonify({"error": f"Profile comparison failed: {str(e)}", "profiles": results}), 500
+    finally:
+        try:
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+        except Exception:
+            pass
+
+class JobDetailsCache:
+    """In-memory TTL + LRU cache of job page content, bounded by entry count and bytes"""
+
+    def __init__(self, ttl, max_entries, max_bytes):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (stored_at, size, job_details)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        """(job_details, age_seconds) or None; a hit makes the entry most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            age = time.time() - entry[0]
+            if age > self.ttl:
+                self._remove(key)
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[2], age
+
+    def put(self, key, job_details):
+        size = len(json.dumps(job_details))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time(), size, job_details)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        return stats
+
+job_details_cache = JobDetailsCache(JOB_DETAILS_CACHE_TTL, JOB_DETAILS_CACHE_MAX_ENTRIES, JOB_DETAILS_CACHE_MAX_BYTES)
+
+def job_cache_key(job_url):
+    """Canonical job id when the URL has one, otherwise the URL without query or fragment"""
+    job_id = job_id_from_link(job_url)
+    if job_id:
+        return f"id:{job_id}"
+    parsed = urlparse(job_url)
+    return f"url:{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+def split_application_info(job_details, session_data, cache_key):
+    """Shared job content, keeping the session-specific application_info on the session.
+    The session's entries expire and are bounded like the shared cache"""
+    shared = dict(job_details)
+    now = time.time()
+    entries = {
+        key: entry for key, entry in session_data.get("application_info", {}).items()
+        if key != cache_key and now - entry[0] <= JOB_DETAILS_CACHE_TTL
+    }
+    # None too, so a page without apply/save buttons still counts as fetched by this session
+    entries[cache_key] = (now, shared.pop("application_info", None))  # insertion order is recency
+    while len(entries) > JOB_DETAILS_CACHE_MAX_ENTRIES:
+        del entries[next(iter(entries))]
+    # Reassigned rather than mutated so a brokered session writes it through
+    session_data["application_info"] = entries
+    return shared
+
+def with_application_info(job_details, session_data, cache_key):
+    """Cached job content plus this session's application_info. It is left out when the entry
+    was filled by another session; "refresh" fetches the page to get it"""
+    entry = session_data.get("application_info", {}).get(cache_key)
+    if entry is None or entry[1] is None or time.time() - entry[0] > JOB_DETAILS_CACHE_TTL:
+        return dict(job_details)
+    return dict(job_details, application_info=entry[1])
+
 @app.route("/api/job-details", methods=["POST"])
+@serialized_per_session
 def get_job_details():
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     data = request.json
     session_id = data.get("session_id")
     job_url = data.get("job_url")
     job_id = data.get("job_id")  # Alternative to job_url
+    light = data.get("light", False)  # Fetch the page over HTTP, using the browser only as a fallback
+    refresh = data.get("refresh", False)  # Skip the cache and re-fetch the page
     
     if not session_id or session_id not in sessions:
         return jsonify({"error": "Invalid session. Please login first."}), 403
@@ -701,13 +2451,45 @@ def get_job_details():
         
         # If job_id is provided, construct the URL
         if job_id and not job_url:
-            job_url = f"https://www.iimjobs.com/job/{job_id}"
+            job_url = f"{IIMJOBS_BASE_URL}/job/{job_id}"
+        
+        cache_key = job_cache_key(job_url)
+        
+        def cache_metadata(hit, age=None):
+            metadata = {"hit": hit, "key": cache_key, **job_details_cache.snapshot()}
+            if age is not None:
+                metadata["age_seconds"] = round(age, 1)
+            return metadata
+        
+        if not refresh:
+            cached = job_details_cache.get(cache_key)
+            if cached:
+                job_details = with_application_info(cached[0], session_data, cache_key)
+                return jsonify({
+                    "job_details": job_details,
+                    "status": "success",
+                    "url": job_details.get("job_url", job_url),
+                    "cache": cache_metadata(True, cached[1])
+                }), 200
         
         print(f"Fetching job details from: {job_url}")
         
+        if light:
+            page = fetch_page_light(session_data, job_url)
+            job_details = extract_job_details_from_html(*page) if page else None
+            if job_details and job_details.get("title"):
+                job_details_cache.put(cache_key, split_application_info(job_details, session_data, cache_key))
+                return jsonify({
+                    "job_details": job_details,
+                    "status": "success",
+                    "url": page[1],
+                    "method": "light_http",
+                    "cache": cache_metadata(False)
+                }), 200
+            print("Light mode could not read the job page, falling back to the browser")
+        
         # Navigate to the job details page
-        driver.get(job_url)
-        time.sleep(3)
+        navigate(driver, job_url, "job_details", ready_selector=JOB_PAGE_READY_SELECTOR)
         
         # Wait for page to load
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
@@ -715,10 +2497,12 @@ def get_job_details():
         job_details = extract_complete_job_details(driver)
         
         if job_details:
+            job_details_cache.put(cache_key, split_application_info(job_details, session_data, cache_key))
             return jsonify({
                 "job_details": job_details,
                 "status": "success",
-                "url": driver.current_url
+                "url": driver.current_url,
+                "cache": cache_metadata(False)
             }), 200
         else:
             return jsonify({
@@ -733,6 +2517,158 @@ def get_job_details():
             "url": job_url if 'job_url' in locals() else "unknown"
         }), 500
 
+# Marks a tab's current document before navigating; the loaded page has a fresh window without it
+START_TAB_NAVIGATION_JS = "window.__jobBatchPending = true; window.location.href = arguments[0];"
+TAB_PAGE_READY_JS = """
+return window.__jobBatchPending === undefined &&
+    document.readyState === 'complete' &&
+    document.querySelector('div.job-header h1, h1') !== null;
+"""
+
+def fetch_job_details_in_tabs(driver, pending, max_tabs, page_timeout):
+    """Extract job details for (index, url) pairs using up to max_tabs tabs of one browser.
+
+    Navigations are started without waiting, so all tabs load in parallel; the
+    driver then cycles through the tabs and extracts each page once it is ready.
+    Returns {index: result}.
+    """
+    pending = list(pending)
+    results = {}
+    loading = {}  # handle -> (index, url, started)
+    original_handle = driver.current_window_handle
+    opened = []
+
+    def start_next(handle):
+        index, url = pending.pop(0)
+        driver.switch_to.window(handle)
+        driver.execute_script(START_TAB_NAVIGATION_JS, url)
+        loading[handle] = (index, url, time.perf_counter())
+
+    try:
+        for _ in range(min(max_tabs, len(pending))):
+            driver.switch_to.new_window("tab")
+            opened.append(driver.current_window_handle)
+            if getattr(driver, "browser_profile", None):
+                apply_browser_profile(driver, driver.browser_profile)  # blocking is per tab
+        for handle in opened:
+            start_next(handle)
+
+        while loading:
+            finished_any = False
+
+            for handle in list(loading):
+                index, url, started = loading[handle]
+                driver.switch_to.window(handle)
+                elapsed = time.perf_counter() - started
+
+                try:
+                    ready = driver.execute_script(TAB_PAGE_READY_JS)
+                except Exception:
+                    ready = False
+                if not ready and elapsed < page_timeout:
+                    continue
+
+                job_details = extract_complete_job_details(driver)
+                if job_details and job_details.get("title"):
+                    results[index] = {"status": "success", "job_url": url, "job_details": job_details}
+                else:
+                    results[index] = {
+                        "status": "error",
+                        "job_url": url,
+                        "error": "Failed to extract job details" if ready else "Timed out waiting for the job page"
+                    }
+                results[index]["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+
+                del loading[handle]
+                finished_any = True
+                if pending:
+                    start_next(handle)
+
+            if loading and not finished_any:
+                time.sleep(READY_POLL_INTERVAL)
+    finally:
+        for handle in opened:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except:
+                pass
+        driver.switch_to.window(original_handle)
+
+    for index, url in pending:
+        results[index] = {"status": "error", "job_url": url, "error": "Not fetched"}
+    return results
+
+@app.route("/api/job-details/batch", methods=["POST"])
+@serialized_per_session
+def get_job_details_batch():
+    """Fetch many job detail pages concurrently in tabs of the session's browser"""
+    data = request.json
+    session_id = data.get("session_id")
+    items = data.get("jobs")  # [{"job_url": ...} or {"job_id": ...}, ...]
+    max_tabs = data.get("max_tabs", JOB_DETAILS_BATCH_TABS)
+    refresh = data.get("refresh", False)
+
+    if not session_id or session_id not in sessions:
+        return jsonify({"error": "Invalid session. Please login first."}), 403
+    if not items or not isinstance(items, list):
+        return jsonify({"error": "jobs must be a non-empty list of {job_url} or {job_id} objects"}), 400
+    if len(items) > JOB_DETAILS_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"At most {JOB_DETAILS_BATCH_MAX_ITEMS} jobs per batch"}), 400
+    if not isinstance(max_tabs, int) or max_tabs < 1:
+        return jsonify({"error": "max_tabs must be a positive integer"}), 400
+
+    session_data = sessions[session_id]
+    driver = session_data["driver"]
+    started = time.perf_counter()
+    results = [None] * len(items)
+    to_fetch = []
+
+    for index, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        job_url = item.get("job_url")
+        if not job_url and item.get("job_id"):
+            job_url = f"{IIMJOBS_BASE_URL}/job/{item['job_id']}"
+        if not job_url:
+            results[index] = {"status": "error", "error": "Either job_url or job_id is required"}
+            continue
+
+        cache_key = job_cache_key(job_url)
+        cached = None if refresh else job_details_cache.get(cache_key)
+        if cached:
+            results[index] = {
+                "status": "success",
+                "job_url": job_url,
+                "job_details": with_application_info(cached[0], session_data, cache_key),
+                "cached": True,
+                "elapsed_seconds": 0.0
+            }
+        else:
+            to_fetch.append((index, job_url))
+
+    try:
+        if to_fetch:
+            print(f"Fetching {len(to_fetch)} job pages in up to {max_tabs} tabs")
+            fetched = fetch_job_details_in_tabs(driver, to_fetch, max_tabs, JOB_DETAILS_BATCH_PAGE_TIMEOUT)
+            for index, result in fetched.items():
+                if result["status"] == "success":
+                    cache_key = job_cache_key(result["job_url"])
+                    job_details_cache.put(cache_key, split_application_info(result["job_details"], session_data, cache_key))
+                result["cached"] = False
+                results[index] = result
+    except Exception as e:
+        return jsonify({"error": f"Batch job details failed: {str(e)}"}), 500
+
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    return jsonify({
+        "results": results,
+        "count": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "cache": job_details_cache.snapshot()
+    }), 200
+
 def extract_complete_job_details(driver):
     from selenium.webdriver.common.by import By
 
@@ -808,6 +2744,8 @@ def extract_complete_job_details(driver):
 
 def safe_get_text(driver, selectors):
     """Safely get text from multiple possible selectors"""
+    from selenium.webdriver.common.by import By
+
     for selector in selectors:
         try:
             elements = driver.find_elements(By.CSS_SELECTOR, selector)
@@ -820,7 +2758,12 @@ def safe_get_text(driver, selectors):
     return None
 
 @app.route("/api/apply-job", methods=["POST"])
+@serialized_per_session
 def apply_to_job():
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     data = request.json
     session_id = data.get("session_id")
     job_url = data.get("job_url")
@@ -838,15 +2781,20 @@ def apply_to_job():
 
         # Always reload the job URL
         driver.get("about:blank")
-        time.sleep(1)
-        driver.get(job_url)
-        time.sleep(3)
+        navigate(driver, job_url, "apply", ready_selector=JOB_PAGE_READY_SELECTOR)
 
         # Step 1: Click "Apply" button
         try:
             apply_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(),'Apply')]")))
             driver.execute_script("arguments[0].click();", apply_button)
-            time.sleep(3)
+
+            # Wait for whichever step comes next: the questions form or the review screen
+            wait_until(
+                driver,
+                lambda d: d.find_elements(By.XPATH, "//*[contains(text(),'Before you submit your application') or contains(text(),'Review your Application') or contains(text(),'You are Applying to') or contains(text(),'You’re applying to')]"),
+                10,
+                "apply_next_step"
+            )
         except Exception as e:
             return jsonify({
                 "status": "failed",
@@ -906,6 +2854,9 @@ def apply_to_job():
 
 def complete_review_and_submit(driver, wait):
     # Better than time.sleep
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
         wait.until(EC.element_to_be_clickable((
             By.XPATH,
@@ -937,8 +2888,9 @@ def complete_review_and_submit(driver, wait):
     try:
         submit_button = driver.find_element(By.XPATH, "//button[contains(text(),'Review & Submit') or contains(text(),'Submit') or contains(text(),'Send Application')]")
         if submit_button.is_displayed() and submit_button.is_enabled():
-            driver.execute_script("arguments[0].click();", submit_button)
-            time.sleep(2)
+            with phase_timings.phase("submit"):
+                driver.execute_script("arguments[0].click();", submit_button)
+                wait_for_network_quiet(driver, timeout=5)
             return jsonify({
                 "status": "success",
                 "message": "Application submitted and review submitted",
@@ -961,7 +2913,12 @@ def complete_review_and_submit(driver, wait):
         }), 206
 
 @app.route("/api/fill-form", methods=["POST"])
+@serialized_per_session
 def submit_form_answers():
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     data = request.json
     session_id = data.get("session_id")
     job_url = data.get("job_url")
@@ -980,8 +2937,7 @@ def submit_form_answers():
 
     try:
         if driver.current_url != job_url:
-            driver.get(job_url)
-            time.sleep(3)
+            navigate(driver, job_url, "job_details", ready_selector=JOB_PAGE_READY_SELECTOR)
 
         filled_count = 0
         combined_answer = form_answers[0].strip().lower()
@@ -1030,8 +2986,9 @@ def submit_form_answers():
                     (By.XPATH, "//button[contains(.,'Next') or contains(.,'Review') or contains(.,'Submit')]")
                 )
             )
-            driver.execute_script("arguments[0].click();", submit_button)
-            time.sleep(3)
+            with phase_timings.phase("submit"):
+                driver.execute_script("arguments[0].click();", submit_button)
+                wait_for_network_quiet(driver)
         except Exception as e:
             print(f"[Submit Button] Error waiting for clickability: {e}")
 
@@ -1046,6 +3003,8 @@ def submit_form_answers():
 
 # Add this function for debugging element visibility
 def debug_page_elements(driver):
+    from selenium.webdriver.common.by import By
+
     print("=== PAGE DEBUG INFO ===")
     print(f"Current URL: {driver.current_url}")
     print(f"Page title: {driver.title}")
@@ -1067,8 +3026,11 @@ def debug_page_elements(driver):
             pass
 
 @app.route("/api/save-job", methods=["POST"])
+@serialized_per_session
 def save_job():
     """Save a job for later through the app"""
+    from selenium.webdriver.common.by import By
+
     data = request.json
     session_id = data.get("session_id")
     job_url = data.get("job_url")
@@ -1085,8 +3047,7 @@ def save_job():
     try:
         # Navigate to job page if not already there
         if driver.current_url != job_url:
-            driver.get(job_url)
-            time.sleep(3)
+            navigate(driver, job_url, "job_details", ready_selector=JOB_PAGE_READY_SELECTOR)
         
         # Find and click save button
         save_selectors = [
@@ -1106,7 +3067,7 @@ def save_job():
                         if not button.get_attribute("disabled"):
                             driver.execute_script("arguments[0].click();", button)
                             saved = True
-                            time.sleep(2)
+                            wait_for_network_quiet(driver, timeout=5)
                             break
                 if saved:
                     break
@@ -1133,13 +3094,232 @@ def save_job():
             "current_url": driver.current_url if driver else "unknown"
         }), 500
 
+class TaskManager:
+    """Runs long scrape/apply requests on a bounded background executor and keeps their results for polling"""
+
+    def __init__(self, max_workers, result_ttl):
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self._executor = None
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {"submitted": 0, "succeeded": 0, "failed": 0}
+        self._durations = deque(maxlen=500)
+
+    def _pool(self):
+        # Started lazily so importing the app does not spawn threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scrape-task")
+            return self._executor
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.result_ttl
+        for task_id in [task_id for task_id, task in self._tasks.items()
+                        if task["finished_at"] and task["finished_at"] < cutoff]:
+            del self._tasks[task_id]
+
+    def submit(self, kind, path, payload):
+        task = {
+            "task_id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": "queued",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": None,
+            "partial_results": [],
+            "status_code": None,
+            "result": None,
+            "error": None,
+            "timings": None
+        }
+        with self._lock:
+            self._purge_expired()
+            self._tasks[task["task_id"]] = task
+            self.stats["submitted"] += 1
+
+        self._pool().submit(self._run, task, path, payload)
+        return task
+
+    def _run(self, task, path, payload):
+        task["started_at"] = time.time()
+        task["status"] = "running"
+        self._local.task = task
+
+        try:
+            # Dispatched like a real request, so before/after_request hooks run for tasks too;
+            # the timings hook hands back the breakdown in the body
+            with app.test_request_context(
+                path, method="POST", json=dict(payload, timings=True),
+                environ_overrides={"iimjobs.task_kind": task["kind"]}
+            ):
+                response = app.full_dispatch_request()
+            task["status_code"] = response.status_code
+            task["result"] = response.get_json()
+            if isinstance(task["result"], dict):
+                task["timings"] = task["result"].pop("timings", None)
+            task["status"] = "succeeded" if response.status_code < 400 else "failed"
+        except Exception as e:
+            print(f"Task {task['task_id']} ({task['kind']}) failed: {str(e)}")
+            task["status"] = "failed"
+            task["error"] = str(e)
+        finally:
+            self._local.task = None
+            # Ends the breakdown when the view raised before the after_request hook ran
+            task["timings"] = task["timings"] or phase_timings.end()
+            task["finished_at"] = time.time()
+            with self._lock:
+                self.stats[task["status"]] += 1
+                self._durations.append(task["finished_at"] - task["started_at"])
+
+    def report(self, kind, payload):
+        """Record a partial result or progress update for the task running on this thread, if any.
+        Only the paginated feed scrape reports as it goes; every other kind, and the light and
+        category paths of "jobs", publish their jobs with the final result"""
+        task = getattr(self._local, "task", None)
+        if task is None:
+            return
+        if kind == "job":
+            task["partial_results"].append(payload)
+        else:
+            task["progress"] = payload
+
+    def get(self, task_id):
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def snapshot(self):
+        with self._lock:
+            statuses = [task["status"] for task in self._tasks.values()]
+            durations = sorted(self._durations)
+            stats = dict(self.stats)
+
+        stats["max_workers"] = self.max_workers
+        stats["queue_depth"] = statuses.count("queued")
+        stats["running"] = statuses.count("running")
+        stats["retained"] = len(statuses)
+        if durations:
+            stats["durations"] = {
+                "count": len(durations),
+                "avg_seconds": round(sum(durations) / len(durations), 3),
+                "p50_seconds": round(durations[len(durations) // 2], 3),
+                "p95_seconds": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3),
+                "max_seconds": round(durations[-1], 3)
+            }
+        return stats
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+task_manager = TaskManager(TASK_MAX_BROWSER_WORKERS, TASK_RESULT_TTL)
+atexit.register(task_manager.shutdown)
+
+# Endpoints that can run as background tasks, by task kind
+TASK_ROUTES = {
+    "jobs": "/api/jobs",
+    "job-details": "/api/job-details",
+    "job-details-batch": "/api/job-details/batch",
+    "apply-job": "/api/apply-job",
+    "save-job": "/api/save-job"
+}
+
+@app.route("/api/tasks", methods=["POST"])
+def submit_task():
+    """Queue a scrape/apply request and return its task id immediately"""
+    data = request.json or {}
+    kind = data.get("kind")
+    session_id = data.get("session_id")
+
+    if kind not in TASK_ROUTES:
+        return jsonify({"error": f"kind must be one of: {', '.join(TASK_ROUTES)}"}), 400
+    if not session_id or session_id not in sessions:
+        return jsonify({"error": "Invalid session. Please login first."}), 403
+
+    payload = {key: value for key, value in data.items() if key != "kind"}
+    task = task_manager.submit(kind, TASK_ROUTES[kind], payload)
+
+    return jsonify({
+        "task_id": task["task_id"],
+        "kind": kind,
+        "status": task["status"],
+        "status_url": f"/api/tasks/{task['task_id']}"
+    }), 202
+
+@app.route("/api/tasks/<task_id>", methods=["GET"])
+def get_task(task_id):
+    """Task status; partial results are returned from ?since=<offset> so polling stays incremental"""
+    task = task_manager.get(task_id)
+    if task is None:
+        return jsonify({"error": "Unknown or expired task"}), 404
+
+    since = request.args.get("since", 0, type=int)
+    partial = task["partial_results"]
+    now = time.time()
+    started = task["started_at"]
+
+    return jsonify({
+        "task_id": task["task_id"],
+        "kind": task["kind"],
+        "status": task["status"],
+        "queued_seconds": round((started or now) - task["submitted_at"], 3),
+        "running_seconds": round((task["finished_at"] or now) - started, 3) if started else None,
+        "progress": task["progress"],
+        "partial_count": len(partial),
+        "partial_results": partial[since:],
+        "status_code": task["status_code"],
+        "result": task["result"],
+        "error": task["error"],
+        "timings": task["timings"]
+    })
+
+@app.route("/api/tasks/stats", methods=["GET"])
+def get_task_stats():
+    return jsonify(task_manager.snapshot())
+
+@app.route("/api/stats", methods=["GET"])
+def get_stats():
+    """Runtime statistics for the driver pool and sessions"""
+    return jsonify({
+        "active_sessions": len(sessions),
+        "sessions": sessions.snapshot(),
+        "driver_pool": driver_pool.snapshot(),
+        "readiness_waits": readiness_snapshot(),
+        "navigation": navigation_snapshot(),
+        "container_selectors": selector_registry.snapshot(),
+        "job_store": job_store.snapshot() if JOB_STORE_ENABLED else None,
+        "job_details_cache": job_details_cache.snapshot(),
+        "tasks": task_manager.snapshot(),
+        "session_scheduler": session_scheduler.snapshot(),
+        "phase_timings": phase_timings.snapshot(),
+        "startup": startup_timings
+    })
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Phase timing histograms and WebDriver command counts in the Prometheus text format.
+    Counts are kept per process: under several gunicorn workers each scrape sees one worker's"""
+    return Response(phase_timings.render(), mimetype="text/plain; version=0.0.4")
+
 @app.route("/")
 def home():
     return "✅ IIMJobs API is running"
 
 
+startup_timings["import_seconds"] = round(time.perf_counter() - _BOOT_STARTED, 3)
+print(f"App module loaded in {startup_timings['import_seconds']}s")
+
+# Snapshot parse workers are spawned and re-import this file as __mp_main__, so
+# nothing above starts threads, browsers or the server
 if __name__ == "__main__":
     print("Flask server is starting...")
+    resolve_chromedriver_path()
+    # The debug reloader re-runs this file in a child (WERKZEUG_RUN_MAIN=true) that serves
+    # the requests; the watching parent never does, so it launches no browsers
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        warm_driver_pool()
     app.run(debug=True, host='0.0.0.0', port=5000)
 
 
@@ -0,0 +1,184 @@
+"""End-to-end benchmark: the API against the local stand-in site.
+
+Starts benchmarks/standin_site.py on a free port, points IIMJOBS_BASE_URL at
+it and drives /api/login, /api/jobs, /api/job-details and /api/apply-job
+through the Flask test client, one full flow per run. Reports wall time,
+WebDriver commands (every command the process sent to chromedriver during
+the call), stand-in site traffic and API response size for each endpoint.
+Needs Chrome and chromedriver, like app.py itself.
+
+    python benchmarks/e2e.py [--runs 3] [--cards 200] [--latency 0.05] [--max-jobs 50] [--light]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from standin_site import create_site  # noqa: E402
+
+ENDPOINTS = ["login", "jobs", "job_details", "apply_job"]
+
+class WebDriverCommands:
+    """Counts every WebDriver command sent by this process"""
+
+    def __init__(self):
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        self._lock = threading.Lock()
+        self.count = 0
+        original = WebDriver.execute
+
+        def counted_execute(driver, driver_command, params=None):
+            with self._lock:
+                self.count += 1
+            return original(driver, driver_command, params)
+
+        WebDriver.execute = counted_execute
+
+    def reset(self):
+        with self._lock:
+            count, self.count = self.count, 0
+        return count
+
+def start_site(args):
+    from werkzeug.serving import make_server
+
+    site = create_site(args.cards, args.page_size, args.latency, args.form_every)
+    server = make_server("127.0.0.1", 0, site, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return site, server, f"http://127.0.0.1:{server.server_port}"
+
+def run_flow(client, site, commands, args):
+    """One login, scrape, details and apply flow; returns {endpoint: measurement}"""
+    results = {}
+
+    def call(endpoint, path, payload):
+        site.traffic.reset()
+        commands.reset()
+        started = time.perf_counter()
+        response = client.post(path, json=payload)
+        wall = time.perf_counter() - started
+        results[endpoint] = {
+            "status": response.status_code,
+            "wall_seconds": wall,
+            "webdriver_commands": commands.reset(),
+            "site": site.traffic.reset(),
+            "api_bytes": len(response.get_data())
+        }
+        return response.get_json(silent=True) or {}
+
+    login = call("login", "/api/login", {"email": "bench@example.com", "password": "bench"})
+    session_id = login.get("session_id")
+    if not session_id:
+        print(f"Login failed: {login}")
+        return results
+
+    try:
+        jobs = call("jobs", "/api/jobs", {
+            "session_id": session_id,
+            "max_jobs": args.max_jobs,
+            "scroll_pages": args.scroll_pages,
+            "extraction_mode": args.extraction_mode,
+            "light": args.light
+        }).get("jobs", [])
+        links = [job["link"] for job in jobs if job.get("link")]
+        if not links:
+            print("No job links scraped; skipping job details and apply")
+            return results
+
+        call("job_details", "/api/job-details", {
+            "session_id": session_id,
+            "job_url": links[0],
+            "light": args.light,
+            "refresh": True
+        })
+        call("apply_job", "/api/apply-job", {"session_id": session_id, "job_url": links[-1]})
+    finally:
+        client.post("/api/logout", json={"session_id": session_id})
+    return results
+
+def summarize(runs):
+    summary = {}
+    for endpoint in ENDPOINTS:
+        measurements = [run[endpoint] for run in runs if endpoint in run]
+        if not measurements:
+            continue
+        walls = [m["wall_seconds"] for m in measurements]
+        summary[endpoint] = {
+            "runs": len(measurements),
+            "statuses": sorted({m["status"] for m in measurements}),
+            "wall_ms_median": round(statistics.median(walls) * 1000, 1),
+            "wall_ms_min": round(min(walls) * 1000, 1),
+            "wall_ms_max": round(max(walls) * 1000, 1),
+            "webdriver_commands_median": statistics.median(m["webdriver_commands"] for m in measurements),
+            "site_requests_median": statistics.median(m["site"]["requests"] for m in measurements),
+            "site_kb_median": round(statistics.median(m["site"]["bytes_in"] + m["site"]["bytes_out"] for m in measurements) / 1024, 1),
+            "api_kb_median": round(statistics.median(m["api_bytes"] for m in measurements) / 1024, 1)
+        }
+    return summary
+
+def print_table(summary):
+    print(f"{'endpoint':<12} {'runs':>4} {'status':>8} {'wall ms':>9} {'min':>9} {'max':>9} {'commands':>9} {'site req':>9} {'site KB':>9} {'api KB':>8}")
+    for endpoint, row in summary.items():
+        statuses = ",".join(str(status) for status in row["statuses"])
+        print(
+            f"{endpoint:<12} {row['runs']:>4} {statuses:>8} {row['wall_ms_median']:>9} {row['wall_ms_min']:>9} "
+            f"{row['wall_ms_max']:>9} {row['webdriver_commands_median']:>9} {row['site_requests_median']:>9} "
+            f"{row['site_kb_median']:>9} {row['api_kb_median']:>8}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--cards", type=int, default=200, help="jobs in the stand-in feed")
+    parser.add_argument("--page-size", type=int, default=20, help="cards per stand-in page and scroll batch")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the stand-in adds to every response")
+    parser.add_argument("--form-every", type=int, default=3, help="every Nth job asks questions before review; 0 for none")
+    parser.add_argument("--max-jobs", type=int, default=50)
+    parser.add_argument("--scroll-pages", type=int, default=5)
+    parser.add_argument("--extraction-mode", default="script", choices=["script", "snapshot", "webdriver"])
+    parser.add_argument("--light", action="store_true", help="ask /api/jobs and /api/job-details for light mode")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    site, server, base_url = start_site(args)
+    # app.py reads these at import time
+    os.environ["IIMJOBS_BASE_URL"] = base_url
+    os.environ.setdefault("JOB_STORE_PATH", os.path.join(tempfile.mkdtemp(), "jobs.db"))
+    import app
+
+    commands = WebDriverCommands()
+    client = app.app.test_client()
+    app.warm_driver_pool()  # launch the pool's browsers before the first timed login
+
+    runs = []
+    try:
+        for run in range(args.runs):
+            runs.append(run_flow(client, site, commands, args))
+            print(f"run {run + 1}/{args.runs}: " + ", ".join(
+                f"{endpoint} {m['status']} {m['wall_seconds'] * 1000:.0f} ms" for endpoint, m in runs[-1].items()
+            ))
+    finally:
+        server.shutdown()
+
+    summary = summarize(runs)
+    print()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_table(summary)
+
+    failed = [endpoint for run in runs for endpoint, m in run.items() if m["status"] >= 400]
+    complete = all(len(run) == len(ENDPOINTS) for run in runs)
+    return 0 if complete and not failed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Microbenchmark: compiled single-pass field extraction vs the pattern-by-pattern loop.
+
+Runs both implementations over the card texts in card_texts.json, fails if
+they disagree on any card, then reports the time per card. The bundled corpus
+is 60 synthetic cards written in the feed's card layout, not captured pages;
+pass --corpus with a JSON list of real card texts to measure those instead.
+
+    python benchmarks/field_extraction.py [--iterations 2000] [--corpus path.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import extract_text_fields, extract_text_fields_sequential  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "card_texts.json")
+
+def time_per_card(extract, corpus, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in corpus:
+            extract(text)
+    return (time.perf_counter() - started) / (iterations * len(corpus))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    mismatches = [
+        text for text in corpus
+        if extract_text_fields(text) != extract_text_fields_sequential(text)
+    ]
+    if mismatches:
+        print(f"{len(mismatches)} cards differ between implementations, first one:")
+        print(mismatches[0])
+        return 1
+
+    sequential = time_per_card(extract_text_fields_sequential, corpus, args.iterations)
+    compiled = time_per_card(extract_text_fields, corpus, args.iterations)
+
+    print(f"cards: {len(corpus)}, iterations: {args.iterations}, results identical")
+    print(f"sequential: {sequential * 1e6:8.2f} us/card")
+    print(f"compiled:   {compiled * 1e6:8.2f} us/card")
+    print(f"speedup:    {sequential / compiled:8.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""Local stand-in for the IIMJobs pages app.py drives.
+
+Serves a login form, /jobfeed, /jobs and /j?kw= with infinite scroll, job
+pages in the MUI layout (/job/<id> and /j/<slug>-<id>.html) and the apply
+flow: optional questions form, review screen, submit. Listings are generated
+deterministically, so every run sees the same jobs. Each response waits
+--latency seconds, and the bytes sent and received are counted per run.
+
+    python benchmarks/standin_site.py [--port 5100] [--cards 200] [--page-size 20] [--latency 0.05]
+    IIMJOBS_BASE_URL=http://127.0.0.1:5100 python app.py
+"""
+import argparse
+import html
+import re
+import threading
+import time
+
+from flask import Flask, abort, redirect, request
+
+SESSION_COOKIE = "standin_session"
+FIRST_JOB_ID = 1000000
+
+TITLES = [
+    "Finance Manager", "Brand Manager - FMCG", "Sales Head", "Marketing Analyst",
+    "Business Analyst", "Category Manager", "Investment Banking Analyst", "Regional Sales Manager",
+    "Product Marketing Manager", "Financial Planning Analyst", "Management Consultant", "Strategy Manager"
+]
+COMPANIES = [
+    "Orbit Consulting", "NorthStar Bank", "Crescent Pharma", "Bluepeak Retail",
+    "Helix Capital", "Meridian Foods", "Trident Logistics", "Aster Technologies", "Summit Insurance"
+]
+LOCATIONS = ["Bangalore", "Mumbai", "Gurgaon", "Hyderabad", "Pune", "Chennai", "Remote"]
+EXPERIENCE = ["2-4 Yrs", "3-5 yrs", "5-8 Yrs", "8-12 Yrs", "12-16 Yrs"]
+SALARIES = ["10 - 18 LPA", "18 - 25 LPA", "25 - 40 LPA", "Not disclosed"]
+POSTED = ["few hours ago", "posted today", "posted yesterday", "2 days ago", "5 days ago"]
+JOB_TYPES = ["Full-time", "Contract", "Permanent"]
+SKILLS = ["Excel", "Financial Modelling", "Stakeholder Management", "Reporting", "SQL", "Forecasting"]
+
+PAGE_STYLE = "<style>.job-card{min-height:140px;border-bottom:1px solid #ddd;padding:8px}</style>"
+
+INFINITE_SCROLL_JS = """
+<script>
+(function () {
+    var list = document.getElementById('job-list');
+    var offset = %(offset)d, total = %(total)d, loading = false;
+    function loadMore() {
+        if (loading || offset >= total) return;
+        if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) return;
+        loading = true;
+        fetch('/feed/more?kw=' + encodeURIComponent(%(kw)s) + '&offset=' + offset, {credentials: 'same-origin'})
+            .then(function (response) { return response.text(); })
+            .then(function (fragment) {
+                list.insertAdjacentHTML('beforeend', fragment);
+                offset += %(page_size)d;
+                loading = false;
+            });
+    }
+    window.addEventListener('scroll', loadMore);
+})();
+</script>
+"""
+
+def job_listing(index):
+    """The generated job at position index of the full feed"""
+    job_id = FIRST_JOB_ID + index
+    title = TITLES[index % len(TITLES)]
+    return {
+        "id": job_id,
+        "title": title,
+        "company": COMPANIES[(index * 7) % len(COMPANIES)],
+        "location": LOCATIONS[(index * 3) % len(LOCATIONS)],
+        "experience": EXPERIENCE[(index * 5) % len(EXPERIENCE)],
+        "salary": SALARIES[index % len(SALARIES)],
+        "posted": POSTED[(index // 3) % len(POSTED)],
+        "job_type": JOB_TYPES[index % len(JOB_TYPES)],
+        "skills": [SKILLS[(index + offset) % len(SKILLS)] for offset in range(4)],
+        "slug": re.sub(r'[^a-z0-9]+', '-', title.lower()).strip("-")
+    }
+
+def page(title, body):
+    return f"<!DOCTYPE html><html><head><title>{html.escape(title)}</title>{PAGE_STYLE}</head><body>{body}</body></html>"
+
+def render_card(job):
+    e = html.escape
+    return (
+        f'<div class="job-card" data-job-id="{job["id"]}">'
+        f'<a href="/j/{job["slug"]}-{job["id"]}.html"><h2>{e(job["title"])}</h2></a>'
+        f'<h3>{e(job["company"])}</h3>'
+        f'<p>{e(job["experience"])} | {e(job["location"])}</p>'
+        f'<p>{e(job["salary"])}</p>'
+        f'<p>Skills: {e(", ".join(job["skills"]))}</p>'
+        f'<p>{e(job["job_type"])}</p>'
+        f'<p>{e(job["posted"])}</p>'
+        f'<span>Apply</span>'
+        f'</div>'
+    )
+
+class Traffic:
+    """Requests and bytes the site has exchanged since the last reset"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "bytes_in": 0, "bytes_out": 0, "applications": 0}
+
+    def record(self, bytes_in, bytes_out):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_in"] += bytes_in
+            self.stats["bytes_out"] += bytes_out
+
+    def count_application(self):
+        with self._lock:
+            self.stats["applications"] += 1
+
+    def reset(self):
+        """Counters so far, starting a new count"""
+        with self._lock:
+            stats = dict(self.stats)
+            for key in self.stats:
+                self.stats[key] = 0
+        return stats
+
+def create_site(cards=200, page_size=20, latency=0.0, form_every=3, password=None):
+    """The stand-in Flask app. Every form_every-th job asks questions before the review
+    screen (0 for none); password, when set, is the only one the login form accepts"""
+    site = Flask(__name__)
+    site.traffic = Traffic()
+    jobs = [job_listing(index) for index in range(cards)]
+
+    def matching_jobs(kw):
+        kw = (kw or "").strip().lower()
+        return [job for job in jobs if kw in job["title"].lower()] if kw else jobs
+
+    def job_by_id(job_id):
+        index = job_id - FIRST_JOB_ID
+        if not 0 <= index < len(jobs):
+            abort(404)
+        return jobs[index]
+
+    def has_form(job):
+        return form_every > 0 and job["id"] % form_every == 0
+
+    @site.before_request
+    def simulate_latency():
+        if latency:
+            time.sleep(latency)
+        public = request.path in ("/", "/login", "/logout")
+        if not public and SESSION_COOKIE not in request.cookies:
+            return redirect(f"/login?next={request.path}")
+
+    @site.after_request
+    def count_traffic(response):
+        bytes_in = (request.content_length or 0) + sum(len(k) + len(v) + 4 for k, v in request.headers.items())
+        site.traffic.record(bytes_in, len(response.get_data()))
+        return response
+
+    @site.route("/")
+    def home():
+        return redirect("/dashboard" if SESSION_COOKIE in request.cookies else "/login")
+
+    @site.route("/login", methods=["GET", "POST"])
+    def login():
+        error = ""
+        if request.method == "POST":
+            email = request.form.get("email", "")
+            given = request.form.get("password", "")
+            if email and given and (password is None or given == password):
+                response = redirect("/dashboard")
+                response.set_cookie(SESSION_COOKIE, email)
+                return response
+            error = '<p class="error">Invalid email or password</p>'
+        return page("Login", (
+            f'<h1>Sign in</h1>{error}'
+            '<form method="post" action="/login">'
+            '<input type="email" name="email" placeholder="Email">'
+            '<input type="password" name="password" placeholder="Password">'
+            '<button type="submit">Login</button>'
+            '</form>'
+        ))
+
+    @site.route("/logout")
+    def logout():
+        response = redirect("/login")
+        response.delete_cookie(SESSION_COOKIE)
+        return response
+
+    @site.route("/dashboard")
+    def dashboard():
+        email = html.escape(request.cookies[SESSION_COOKIE])
+        return page("Dashboard", (
+            f'<h1>Welcome, {email}</h1>'
+            '<nav><a href="/jobfeed">Job feed</a> <a href="/profile">My profile</a> <a href="/logout">Logout</a></nav>'
+        ))
+
+    def feed_page(title, kw=None):
+        listing = matching_jobs(kw)
+        first = listing[:page_size]
+        script = INFINITE_SCROLL_JS % {
+            "offset": len(first),
+            "total": len(listing),
+            "page_size": page_size,
+            "kw": repr(kw or "")
+        }
+        return page(title, (
+            f'<h1>{html.escape(title)}</h1>'
+            f'<div id="job-list">{"".join(render_card(job) for job in first)}</div>'
+            f'{script}'
+        ))
+
+    @site.route("/jobfeed")
+    def jobfeed():
+        return feed_page("Job feed")
+
+    @site.route("/jobs")
+    def jobs_page():
+        return feed_page("Jobs")
+
+    @site.route("/j")
+    def search():
+        kw = request.args.get("kw")
+        return feed_page(f"Jobs matching {kw}" if kw else "Search jobs", kw)
+
+    @site.route("/feed/more")
+    def feed_more():
+        offset = request.args.get("offset", 0, type=int)
+        listing = matching_jobs(request.args.get("kw"))
+        return "".join(render_card(job) for job in listing[offset:offset + page_size])
+
+    def job_page(job):
+        e = html.escape
+        skills = "".join(f"<span>#{e(skill.replace(' ', ''))}</span>" for skill in job["skills"])
+        return page(job["title"], (
+            f'<div class="job-header"><h1>{e(job["title"])}</h1>'
+            f'<span>{e(job["experience"])}</span><span>{e(job["location"])}</span></div>'
+            f'<div>{skills}</div>'
+            f'<div class="MuiPaper-root MuiPaper-elevation1">'
+            f'<p>{e(job["company"])} is hiring a {e(job["title"])} in {e(job["location"])}.</p>'
+            f'<p>You will own reporting, planning and stakeholder reviews for the business unit.</p>'
+            f'<ul><li>{e(job["experience"])} of relevant experience</li>'
+            f'<li>Strong {e(job["skills"][0])} and {e(job["skills"][1])} skills</li>'
+            f'<li>MBA from a premier institute preferred</li></ul>'
+            f'</div>'
+            f'<button type="button" onclick="location.href=\'/job/{job["id"]}/apply\'">Apply</button>'
+            f'<button type="button" aria-label="Save job" onclick="this.textContent=\'Saved\'">Save</button>'
+        ))
+
+    @site.route("/job/<int:job_id>")
+    def job_details(job_id):
+        return job_page(job_by_id(job_id))
+
+    @site.route("/j/<slug>")
+    def job_details_by_slug(slug):
+        match = re.search(r'-(\d+)\.html?$', slug)
+        if not match:
+            abort(404)
+        return job_page(job_by_id(int(match.group(1))))
+
+    @site.route("/job/<int:job_id>/apply", methods=["GET", "POST"])
+    def apply(job_id):
+        job = job_by_id(job_id)
+        if request.method == "POST" or not has_form(job):
+            return redirect(f"/job/{job_id}/review")
+        return page(f"Apply - {job['title']}", (
+            '<p>Before you submit your application, tell the recruiter more about yourself</p>'
+            f'<form method="post" action="/job/{job_id}/apply">'
+            '<div class="MuiBox-root"><p>Are you willing to relocate to the job location?</p>'
+            '<label>Yes</label><input type="radio" name="relocate" value="yes">'
+            '<label>No</label><input type="radio" name="relocate" value="no"></div>'
+            '<div class="MuiBox-root"><p>How many years of team management experience do you have?</p>'
+            '<textarea name="management"></textarea></div>'
+            '<button type="submit">Next</button>'
+            '</form>'
+        ))
+
+    @site.route("/job/<int:job_id>/review")
+    def review(job_id):
+        job = job_by_id(job_id)
+        email = html.escape(request.cookies[SESSION_COOKIE])
+        sections = [
+            ("Resume", "resume.pdf, updated 3 days ago"),
+            ("Personal Details", email),
+            ("Education", "MBA, Finance"),
+            ("Work Experience", job["experience"]),
+            ("Notice Period", "30 days")
+        ]
+        return page(f"Review - {job['title']}", (
+            f'<h2>You are Applying to {html.escape(job["title"])}</h2>'
+            + "".join(f'<div class="MuiBox-root"><h6>{name}</h6><p>{html.escape(value)}</p></div>' for name, value in sections)
+            + f'<form method="post" action="/job/{job_id}/submit"><button type="submit">Submit</button></form>'
+        ))
+
+    @site.route("/job/<int:job_id>/submit", methods=["POST"])
+    def submit(job_id):
+        job = job_by_id(job_id)
+        site.traffic.count_application()
+        return page("Application sent", f'<h1>Application sent</h1><p>{html.escape(job["title"])} at {html.escape(job["company"])}</p>')
+
+    return site
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5100)
+    parser.add_argument("--cards", type=int, default=200, help="jobs in the full feed")
+    parser.add_argument("--page-size", type=int, default=20, help="cards per page and per infinite-scroll batch")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--form-every", type=int, default=3, help="every Nth job asks questions before review; 0 for none")
+    parser.add_argument("--password", help="the only password the login form accepts; any by default")
+    args = parser.parse_args()
+
+    site = create_site(args.cards, args.page_size, args.latency, args.form_every, args.password)
+    print(f"Stand-in site on http://{args.host}:{args.port} ({args.cards} jobs, {args.page_size} per page, {args.latency}s latency)")
+    site.run(host=args.host, port=args.port, threaded=True)
+
+if __name__ == "__main__":
+    main()
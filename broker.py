@@ -0,0 +1,263 @@
+"""Browser broker: one process that owns every Chrome session.
+
+Flask workers started with BROWSER_BROKER_ADDRESS connect to it over a Unix
+socket, look sessions up by session_id and drive the browser directly through
+the session's chromedriver. Sessions survive Flask worker restarts and are
+visible to every worker. A worker holds the session's lease while it drives
+the browser, so requests from different workers never overlap.
+
+The manager protocol unpickles what clients send, so the broker and its
+workers must share a secret BROWSER_BROKER_AUTHKEY:
+
+    BROWSER_BROKER_ADDRESS=/tmp/iimjobs-broker.sock BROWSER_BROKER_AUTHKEY=... python broker.py
+"""
+import os
+import threading
+import time
+from collections import deque
+from multiprocessing.managers import BaseManager
+
+from browsers import (
+    DRIVER_POOL_MAX_SIZE,
+    DRIVER_POOL_SIZE,
+    MAX_SESSIONS,
+    SESSION_EVICTION_POLICY,
+    SESSION_IDLE_TTL,
+    DriverPool,
+    expired_sessions,
+    plan_admission,
+    resolve_chromedriver_path,
+    start_session_reaper,
+    teardown_session,
+)
+
+BROWSER_BROKER_ADDRESS = os.environ.get("BROWSER_BROKER_ADDRESS")
+BROWSER_BROKER_AUTHKEY = os.environ.get("BROWSER_BROKER_AUTHKEY")
+
+# A lease not released within this many seconds (its worker died mid-request) may be taken over
+BROWSER_LEASE_TTL = float(os.environ.get("BROWSER_LEASE_TTL", "600"))
+
+def broker_authkey():
+    if not BROWSER_BROKER_AUTHKEY:
+        raise RuntimeError("BROWSER_BROKER_AUTHKEY must be set to a shared secret to use the browser broker")
+    return BROWSER_BROKER_AUTHKEY.encode()
+
+class BrokerManager(BaseManager):
+    pass
+
+class BrowserBroker:
+    """session_id -> driver owned by this process, plus the JSON-safe fields workers share"""
+
+    def __init__(self, driver_pool):
+        self.driver_pool = driver_pool
+        # session_id -> {"driver", "active", "in_use", "fields", "created_at", "last_used", "lease", "waiters"}
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._lease_changed = threading.Condition(self._lock)
+        self.stats = {"launched": 0, "registered": 0, "lookups": 0, "logouts": 0, "reaped": 0, "evicted": 0,
+                      "rejected": 0, "leases": 0, "lease_timeouts": 0, "leases_expired": 0}
+
+    def launch(self, session_id):
+        """Take a browser from the pool for a login in progress; returns how to attach to it,
+        or {"retry_after": seconds} when MAX_SESSIONS are open and none may be evicted"""
+        with self._lock:
+            candidates = self._candidates()
+            pending = len(self._sessions) - len(candidates)
+            action, detail = plan_admission(candidates, pending)
+            if action == "reject":
+                self.stats["rejected"] += 1
+                return {"retry_after": detail}
+            # Reserve the slot before launching, so concurrent logins cannot overshoot the limit
+            self._sessions[session_id] = {"driver": None, "active": False, "in_use": 0, "fields": {},
+                                          "lease": None, "waiters": deque()}
+            # Removed under the same lock that found it idle, so no request can pick it up meanwhile
+            evicted = self._remove(detail, "evicted") if action == "evict" else None
+
+        if evicted is not None:
+            print(f"Evicting least recently used session {detail}")
+            teardown_session(evicted)
+
+        try:
+            driver = self.driver_pool.acquire()
+        except Exception:
+            with self._lock:
+                self._sessions.pop(session_id, None)
+            raise
+
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id].update(driver=driver, created_at=now, last_used=now)
+            self.stats["launched"] += 1
+        return self._endpoint(driver)
+
+    def _candidates(self):
+        return [(session_id, entry["last_used"], entry["in_use"])
+                for session_id, entry in self._sessions.items() if entry["active"]]
+
+    def _endpoint(self, driver):
+        return {"executor_url": driver.service.service_url, "webdriver_session_id": driver.session_id}
+
+    def register(self, session_id, fields):
+        """Mark a launched browser as a logged-in session"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return False
+            entry["active"] = True
+            entry["fields"].update(fields)
+            self.stats["registered"] += 1
+            return True
+
+    def lookup(self, session_id):
+        with self._lock:
+            self.stats["lookups"] += 1
+            entry = self._sessions.get(session_id)
+            if entry is None or not entry["active"]:
+                return None
+            entry["last_used"] = time.time()
+            return dict(self._endpoint(entry["driver"]), fields=dict(entry["fields"]))
+
+    def update(self, session_id, fields):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry["fields"].update(fields)
+
+    def begin_use(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry["in_use"] += 1
+
+    def end_use(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry["in_use"] = max(0, entry["in_use"] - 1)
+                entry["last_used"] = time.time()
+
+    def acquire(self, session_id, owner, timeout):
+        """Wait, in arrival order, for exclusive use of the session's browser. True once owner
+        holds the lease, False on timeout, None when the session does not exist (any more)"""
+        deadline = time.time() + timeout
+        with self._lease_changed:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            waiters = entry["waiters"]
+            waiters.append(owner)
+            try:
+                while True:
+                    if self._sessions.get(session_id) is not entry:
+                        return None
+                    now = time.time()
+                    lease = entry["lease"]
+                    if lease is not None and lease[1] <= now:
+                        print(f"Lease on session {session_id} held by {lease[0]} expired")
+                        self.stats["leases_expired"] += 1
+                        entry["lease"] = lease = None
+                    if lease is None and waiters[0] == owner:
+                        entry["lease"] = (owner, now + BROWSER_LEASE_TTL)
+                        self.stats["leases"] += 1
+                        return True
+                    if now >= deadline:
+                        self.stats["lease_timeouts"] += 1
+                        return False
+                    self._lease_changed.wait(min(deadline, lease[1]) - now if lease else deadline - now)
+            finally:
+                waiters.remove(owner)
+                self._lease_changed.notify_all()
+
+    def release(self, session_id, owner):
+        with self._lease_changed:
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry["lease"] is not None and entry["lease"][0] == owner:
+                entry["lease"] = None
+                self._lease_changed.notify_all()
+
+    def _remove(self, session_id, reason):
+        """Forget a session, waking anyone waiting for its lease; call with self._lock held"""
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self.stats["logouts" if reason == "logout" else reason] += 1
+            self._lease_changed.notify_all()
+        return entry
+
+    def close(self, session_id, reason="logout"):
+        with self._lock:
+            entry = self._remove(session_id, reason)
+        if entry is None:
+            return False
+        teardown_session(entry)
+        return True
+
+    def reap_idle(self):
+        with self._lock:
+            expired = [(session_id, self._remove(session_id, "reaped")) for session_id in expired_sessions(self._candidates())]
+        for session_id, entry in expired:
+            print(f"Reaping session {session_id}, idle for more than {SESSION_IDLE_TTL}s")
+            teardown_session(entry)
+        return len(expired)
+
+    def count(self):
+        with self._lock:
+            return sum(1 for entry in self._sessions.values() if entry["active"])
+
+    def snapshot(self):
+        now = time.time()
+        with self._lock:
+            stats = dict(self.stats)
+            candidates = self._candidates()
+            stats["active"] = len(candidates)
+            stats["pending_logins"] = len(self._sessions) - len(candidates)
+            stats["in_use"] = sum(1 for _, _, in_use in candidates if in_use)
+            stats["leased"] = sum(1 for entry in self._sessions.values() if entry.get("lease"))
+            stats["max_idle_seconds"] = round(max((now - last_used for _, last_used, _ in candidates), default=0.0), 1)
+        stats["max_sessions"] = MAX_SESSIONS
+        stats["idle_ttl_seconds"] = SESSION_IDLE_TTL
+        stats["eviction_policy"] = SESSION_EVICTION_POLICY
+        stats["driver_pool"] = self.driver_pool.snapshot()
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            entries = list(self._sessions.values())
+            self._sessions.clear()
+        for entry in entries:
+            teardown_session(entry)
+        self.driver_pool.shutdown()
+
+BrokerManager.register("broker")
+
+def connect_broker(address):
+    """Proxy to the broker at address; each thread gets its own connection"""
+    manager = BrokerManager(address=address, authkey=broker_authkey())
+    manager.connect()
+    return manager.broker()
+
+def serve(address):
+    authkey = broker_authkey()
+    if os.path.exists(address):
+        os.unlink(address)
+
+    resolve_chromedriver_path()
+    driver_pool = DriverPool(DRIVER_POOL_SIZE, DRIVER_POOL_MAX_SIZE)
+    broker = BrowserBroker(driver_pool)
+    driver_pool.start()
+    start_session_reaper(broker.reap_idle)
+
+    BrokerManager.register("broker", callable=lambda: broker)
+    manager = BrokerManager(address=address, authkey=authkey)
+    server = manager.get_server()
+    print(f"Browser broker listening on {address}")
+    try:
+        server.serve_forever()
+    finally:
+        broker.shutdown()
+
+if __name__ == "__main__":
+    if not BROWSER_BROKER_ADDRESS:
+        raise SystemExit("Set BROWSER_BROKER_ADDRESS to the Unix socket path to listen on")
+    if not BROWSER_BROKER_AUTHKEY:
+        raise SystemExit("Set BROWSER_BROKER_AUTHKEY to a shared secret; the broker unpickles what clients send")
+    serve(BROWSER_BROKER_ADDRESS)
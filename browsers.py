@@ -0,0 +1,267 @@
+"""Chrome drivers and the session lifecycle rules shared by app.py and broker.py.
+
+Launching and pooling browsers, and deciding which sessions to admit, evict
+or reap, happen in whichever process owns the browsers: each Flask worker, or
+the browser broker. Nothing here imports Flask or app.py, so the broker can
+use it without loading the web app.
+"""
+import os
+import queue
+import shutil
+import threading
+import time
+
+# Number of pre-launched drivers kept ready for /api/login, capped by DRIVER_POOL_MAX_SIZE
+DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "2"))
+DRIVER_POOL_MAX_SIZE = int(os.environ.get("DRIVER_POOL_MAX_SIZE", "4"))
+# Idle pooled browsers older than this are quit instead of handed out (long-lived Chrome grows)
+DRIVER_POOL_MAX_IDLE = float(os.environ.get("DRIVER_POOL_MAX_IDLE", "1800"))
+
+# Page-load strategy for new browsers: "normal" waits for the load event, "eager" returns at
+# DOMContentLoaded and leaves readiness to the network-idle / target-selector signal.
+# "devtools" idle counts in-flight requests from Chrome's performance log; "resources"
+# watches the Performance API resource count
+PAGE_LOAD_STRATEGY = os.environ.get("PAGE_LOAD_STRATEGY", "normal")
+NETWORK_IDLE_SIGNAL = os.environ.get("NETWORK_IDLE_SIGNAL", "devtools" if PAGE_LOAD_STRATEGY == "eager" else "resources")
+
+# Requests for one session run one at a time, in order; how long a request may wait for its turn
+SESSION_QUEUE_TIMEOUT = float(os.environ.get("SESSION_QUEUE_TIMEOUT", "300"))
+SESSION_QUEUE_RETRY_AFTER = float(os.environ.get("SESSION_QUEUE_RETRY_AFTER", "5"))
+
+# Session lifecycle: idle sessions are closed after SESSION_IDLE_TTL; at MAX_SESSIONS a new
+# login either evicts the least recently used idle session ("lru") or is rejected ("reject")
+SESSION_IDLE_TTL = float(os.environ.get("SESSION_IDLE_TTL", "1800"))
+SESSION_REAP_INTERVAL = float(os.environ.get("SESSION_REAP_INTERVAL", "60"))
+MAX_SESSIONS = int(os.environ.get("MAX_SESSIONS", "10"))
+SESSION_EVICTION_POLICY = os.environ.get("SESSION_EVICTION_POLICY", "reject")
+
+# Explicit chromedriver binary; when unset it is resolved once via webdriver_manager
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+
+startup_timings = {}  # filled in here and by app.py, served by /api/stats
+_chromedriver_path = None
+_chromedriver_resolved = False
+_chromedriver_lock = threading.Lock()
+
+def resolve_chromedriver_path():
+    """Resolve the chromedriver binary once per process and reuse it for every Service"""
+    global _chromedriver_path, _chromedriver_resolved
+
+    if _chromedriver_resolved:
+        return _chromedriver_path
+
+    with _chromedriver_lock:
+        if _chromedriver_resolved:
+            return _chromedriver_path
+
+        started = time.perf_counter()
+        path = CHROMEDRIVER_PATH
+        source = "env"
+
+        if not path:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+                source = "webdriver_manager"
+            except Exception as e:
+                print(f"webdriver_manager lookup failed: {str(e)}")
+
+        if not path:
+            # Offline host: use a chromedriver on PATH, or let Selenium locate one itself
+            path = shutil.which("chromedriver")
+            source = "path" if path else "selenium_manager"
+
+        _chromedriver_path = path
+        _chromedriver_resolved = True
+        startup_timings["chromedriver_resolve_seconds"] = round(time.perf_counter() - started, 3)
+        startup_timings["chromedriver_source"] = source
+        print(f"Using chromedriver: {path or 'selenium manager'} ({source})")
+
+    return _chromedriver_path
+
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+def create_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f"--user-agent={BROWSER_USER_AGENT}")
+    chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+    if NETWORK_IDLE_SIGNAL == "devtools":
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    
+    driver_path = resolve_chromedriver_path()
+    service = Service(driver_path) if driver_path else Service()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+def quit_driver(driver):
+    """Quit a driver, ignoring errors from an already dead browser"""
+    try:
+        driver.quit()
+    except:
+        pass
+
+class DriverPool:
+    """Warm pool of pre-launched drivers so login does not pay for a Chrome cold start"""
+
+    def __init__(self, size, max_size, launch=None, max_idle=DRIVER_POOL_MAX_IDLE):
+        self.size = max(0, min(size, max_size))
+        self.launch = launch or create_driver
+        self.max_idle = max_idle
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._refill_needed = threading.Event()
+        self._thread = None
+        self._closed = False
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "launched": 0,
+            "launch_failures": 0,
+            "discarded_unhealthy": 0,
+            "recycled_stale": 0
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def start(self):
+        """Start the background refill thread (idempotent)"""
+        if self.size == 0 or self._closed:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refill_loop, name="driver-pool-refill", daemon=True)
+                self._thread.start()
+        self._refill_needed.set()
+
+    def _refill_loop(self):
+        backoff = 1
+        while not self._closed:
+            self._refill_needed.wait()
+            self._refill_needed.clear()
+
+            while not self._closed and self._idle.qsize() < self.size:
+                try:
+                    driver = self.launch()
+                except Exception as e:
+                    self._count("launch_failures")
+                    print(f"Driver pool: failed to launch driver: {str(e)}")
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 60)
+                    continue
+
+                backoff = 1
+                self._count("launched")
+                if self._closed:
+                    quit_driver(driver)
+                    break
+                self._idle.put((driver, time.time()))
+                print(f"Driver pool: {self._idle.qsize()}/{self.size} drivers ready")
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1 and len(driver.window_handles) > 0
+        except:
+            return False
+
+    def acquire(self):
+        """Hand out a healthy pre-launched driver, or launch one if the pool is empty"""
+        self.start()
+
+        while True:
+            try:
+                driver, launched_at = self._idle.get_nowait()
+            except queue.Empty:
+                self._count("misses")
+                return self.launch()
+
+            self._refill_needed.set()
+
+            if time.time() - launched_at > self.max_idle:
+                self._count("recycled_stale")
+                quit_driver(driver)
+                continue
+
+            if self._is_healthy(driver):
+                self._count("hits")
+                return driver
+
+            self._count("discarded_unhealthy")
+            quit_driver(driver)
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["idle"] = self._idle.qsize()
+        stats["target_size"] = self.size
+        return stats
+
+    def shutdown(self):
+        """Quit every idle driver and stop refilling"""
+        self._closed = True
+        self._refill_needed.set()
+        while True:
+            try:
+                driver, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            quit_driver(driver)
+
+def plan_admission(candidates, pending, now=None):
+    """Room for one more session: ("admit", None), ("evict", session_id) or ("reject", retry_after).
+    candidates are (session_id, last_used, in_use) for the logged-in sessions; pending counts logins in progress"""
+    if len(candidates) + pending < MAX_SESSIONS:
+        return "admit", None
+
+    now = now or time.time()
+    idle = sorted((last_used, session_id) for session_id, last_used, in_use in candidates if not in_use)
+    if not idle:
+        return "reject", int(SESSION_QUEUE_RETRY_AFTER)
+    last_used, session_id = idle[0]
+    if SESSION_EVICTION_POLICY == "lru":
+        return "evict", session_id
+    # The least recently used session is the next one the reaper will close
+    return "reject", max(1, int(SESSION_IDLE_TTL - (now - last_used)) + 1)
+
+def expired_sessions(candidates, now=None):
+    """Sessions idle for longer than SESSION_IDLE_TTL and not serving a request"""
+    now = now or time.time()
+    return [session_id for session_id, last_used, in_use in candidates
+            if not in_use and now - last_used > SESSION_IDLE_TTL]
+
+def start_session_reaper(reap):
+    """Call reap() every SESSION_REAP_INTERVAL seconds on a daemon thread"""
+    def loop():
+        while True:
+            time.sleep(SESSION_REAP_INTERVAL)
+            try:
+                reap()
+            except Exception as e:
+                print(f"Session reaper failed: {str(e)}")
+
+    thread = threading.Thread(target=loop, name="session-reaper", daemon=True)
+    thread.start()
+    return thread
+
+def teardown_session(session_data):
+    """Release everything a session holds in this process; logout, eviction and the reaper all end here"""
+    http = session_data.get("http")
+    if http is not None:
+        try:
+            http.close()
+        except Exception:
+            pass
+    if session_data.get("driver") is not None:
+        quit_driver(session_data["driver"])
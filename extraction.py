@@ -0,0 +1,750 @@
+"""Turn raw IIMJobs job-card data into job records.
+
+Nothing here talks to the browser: the callers collect each card's text,
+company/title candidates, link and logo (through WebDriver or a single
+in-page script) and these helpers apply the same post-processing to all of
+them. The snapshot helpers at the bottom do the whole extraction from a
+saved page_source. The module stays free of Flask and Selenium imports so it
+can be used from worker processes.
+"""
+import atexit
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+# Site root; point it at a local stand-in server for testing
+IIMJOBS_BASE_URL = os.environ.get("IIMJOBS_BASE_URL", "https://www.iimjobs.com").rstrip("/")
+
+# Worker processes that parse page_source snapshots for the "snapshot" extraction mode
+SNAPSHOT_PARSE_WORKERS = int(os.environ.get("SNAPSHOT_PARSE_WORKERS", "2"))
+
+# Container selectors tried in order; the first that matches more than one element wins
+JOB_CONTAINER_SELECTORS = [
+    # IIMJobs specific selectors
+    "[data-job-id]",
+    ".job-item",
+    ".job-card",
+    ".feed-item",
+    ".job-listing",
+    ".job-row",
+    ".job-tile",
+    ".job-container",
+    # Generic selectors
+    "div[class*='job']",
+    "li[class*='job']",
+    "div[class*='listing']",
+    "div[class*='card']",
+    ".card",
+    # More specific patterns
+    "div:has(img[src*='logo'])",
+    "div:has(a[href*='job'])",
+    "div:has(a[href*='view'])",
+    # Table-based layouts
+    "tr[class*='job']",
+    "tbody tr"
+]
+
+# Used when no container selector matches: divs mentioning at least two of these
+JOB_KEYWORDS = ["hiring", "experience", "years", "salary", "apply", "job", "position", "role"]
+
+COMPANY_SELECTORS = [
+    "h3", "h4", "h2", ".company", ".company-name", "[data-company]",
+    "strong", "b", ".employer", ".org-name"
+]
+
+TITLE_SELECTORS = [
+    "h1", "h2", "h3", "h4", "h5", ".title", ".job-title", ".position",
+    "a[href*='job']", "a[href*='view']", ".role", ".designation"
+]
+
+EXPERIENCE_PATTERNS = [
+    r'(\d+\s*-\s*\d+\s*[Yy]rs?)',
+    r'(\d+\+?\s*[Yy]rs?)',
+    r'(\d+\s*to\s*\d+\s*[Yy]ears?)',
+    r'(Fresher)',
+    r'(Entry\s*level)'
+]
+
+LOCATION_KEYWORDS = [
+    "Hyderabad", "Bangalore", "Mumbai", "Delhi", "Chennai", "Pune", "Kolkata",
+    "Gurgaon", "Noida", "Ahmedabad", "Jaipur", "Indore", "Bhopal", "Lucknow",
+    "Kochi", "Coimbatore", "Vadodara", "Nagpur", "Visakhapatnam", "Surat",
+    "Remote", "Work from home", "WFH"
+]
+
+SALARY_PATTERNS = [
+    r'(₹\s*\d+[,\d]*\s*-\s*₹?\s*\d+[,\d]*)',
+    r'(\d+\s*-\s*\d+\s*LPA)',
+    r'(\d+\s*-\s*\d+\s*Lakh)',
+    r'(Not\s*disclosed)',
+    r'(Salary\s*negotiable)'
+]
+
+DATE_PATTERNS = [
+    r'(posted\s+today)',
+    r'(posted\s+yesterday)',
+    r'(posted\s+\d+\s+days?\s+ago)',
+    r'(\d+\s+days?\s+ago)',
+    r'(few\s+hours?\s+ago)'
+]
+
+JOB_TYPE_KEYWORDS = ["Full-time", "Part-time", "Contract", "Permanent", "Temporary", "Internship"]
+
+# Lower-case literals each pattern cannot match without (checked on the
+# lower-cased text). They avoid i, s and k, whose IGNORECASE matches include
+# characters that str.lower() does not map back to them.
+PATTERN_GUARDS = {
+    EXPERIENCE_PATTERNS[0]: ("yr",),
+    EXPERIENCE_PATTERNS[1]: ("yr",),
+    EXPERIENCE_PATTERNS[2]: ("to", "year"),
+    EXPERIENCE_PATTERNS[3]: ("fre",),
+    EXPERIENCE_PATTERNS[4]: ("entry",),
+    SALARY_PATTERNS[0]: ("₹",),
+    SALARY_PATTERNS[1]: ("lpa",),
+    SALARY_PATTERNS[2]: ("la",),
+    SALARY_PATTERNS[3]: ("not",),
+    SALARY_PATTERNS[4]: ("negot",),
+    DATE_PATTERNS[0]: ("today",),
+    DATE_PATTERNS[1]: ("yesterday",),
+    DATE_PATTERNS[2]: ("ago",),
+    DATE_PATTERNS[3]: ("ago",),
+    DATE_PATTERNS[4]: ("ago",)
+}
+
+def _compile_patterns(patterns, flags=0):
+    return [(re.compile(pattern, flags), PATTERN_GUARDS.get(pattern, ())) for pattern in patterns]
+
+def _compile_keywords(keywords):
+    """One alternation over the lower-cased keywords, plus, per keyword, the keywords whose
+    occurrences can overlap its own and so be skipped by a non-overlapping scan"""
+    needles = [keyword.lower() for keyword in keywords]
+    regex = re.compile("|".join(re.escape(needle) for needle in needles))
+    index_of = {}
+    for index, needle in enumerate(needles):
+        index_of.setdefault(needle, index)
+    overlapping = [
+        [other for other, candidate in enumerate(needles) if other != index and any(
+            needle[offset:offset + len(candidate)] == candidate[:len(needle) - offset]
+            for offset in range(len(needle))
+        )]
+        for index, needle in enumerate(needles)
+    ]
+    return regex, index_of, needles, keywords, overlapping
+
+class TextFieldEngine:
+    """Precompiled extraction of experience, location, salary, posted date and job type.
+
+    The text is lower-cased once. A pattern only runs when its guard literals
+    occur in the text (a cheap substring check), and each keyword list is one
+    compiled alternation resolved by list order. Results are the same as trying
+    each pattern and keyword in order.
+    """
+
+    def __init__(self):
+        self.experience = _compile_patterns(EXPERIENCE_PATTERNS, re.IGNORECASE)
+        self.salary = _compile_patterns(SALARY_PATTERNS, re.IGNORECASE)
+        self.posted = _compile_patterns(DATE_PATTERNS)
+        self.locations = _compile_keywords(LOCATION_KEYWORDS)
+        self.job_types = _compile_keywords(JOB_TYPE_KEYWORDS)
+
+    @staticmethod
+    def _first_match(patterns, text, lowered):
+        for regex, guards in patterns:
+            for guard in guards:
+                if guard not in lowered:
+                    break
+            else:
+                match = regex.search(text)
+                if match:
+                    return match.group(1)
+        return None
+
+    @staticmethod
+    def _first_keyword(keywords, lowered):
+        regex, index_of, needles, originals, overlapping = keywords
+        found = {index_of[match.group()] for match in regex.finditer(lowered)}
+        if not found:
+            return None
+        # A keyword listed earlier can only have been skipped inside an overlapping match
+        best = min(found)
+        for index in found:
+            for other in overlapping[index]:
+                if other < best and needles[other] in lowered:
+                    best = other
+        return originals[best]
+
+    def extract(self, container_text):
+        lowered = container_text.lower()
+        fields = {}
+
+        experience = self._first_match(self.experience, container_text, lowered)
+        if experience:
+            fields["experience"] = experience
+
+        location = self._first_keyword(self.locations, lowered)
+        if location:
+            fields["location"] = location
+
+        salary = self._first_match(self.salary, container_text, lowered)
+        if salary:
+            fields["salary"] = salary
+
+        posted = self._first_match(self.posted, lowered, lowered)
+        if posted:
+            fields["posted"] = posted.title()
+
+        job_type = self._first_keyword(self.job_types, lowered)
+        if job_type:
+            fields["job_type"] = job_type
+
+        return fields
+
+text_field_engine = TextFieldEngine()
+
+def extract_text_fields(container_text):
+    """Experience, location, salary, posted date and job type found in a card's text"""
+    return text_field_engine.extract(container_text)
+
+def extract_text_fields_sequential(container_text):
+    """Pattern-by-pattern reference for extract_text_fields, kept for benchmarks and parity checks"""
+    fields = {}
+
+    for pattern in EXPERIENCE_PATTERNS:
+        match = re.search(pattern, container_text, re.IGNORECASE)
+        if match:
+            fields["experience"] = match.group(1)
+            break
+
+    for location in LOCATION_KEYWORDS:
+        if location.lower() in container_text.lower():
+            fields["location"] = location
+            break
+
+    for pattern in SALARY_PATTERNS:
+        match = re.search(pattern, container_text, re.IGNORECASE)
+        if match:
+            fields["salary"] = match.group(1)
+            break
+
+    for pattern in DATE_PATTERNS:
+        match = re.search(pattern, container_text.lower())
+        if match:
+            fields["posted"] = match.group(1).title()
+            break
+
+    for job_type in JOB_TYPE_KEYWORDS:
+        if job_type.lower() in container_text.lower():
+            fields["job_type"] = job_type
+            break
+
+    return fields
+
+def normalize_link(href):
+    """Absolute job link, or None for hrefs that are not http(s) or site-relative"""
+    if not href:
+        return None
+    if href.startswith("http"):
+        return href
+    if href.startswith("/"):
+        return f"{IIMJOBS_BASE_URL}{href}"
+    return None
+
+def apply_line_fallback(job_data, container_text):
+    """Take title/company from the first short lines when no selector matched either"""
+    if job_data.get("title") or job_data.get("company"):
+        return
+
+    lines = [line.strip() for line in container_text.split('\n') if line.strip()]
+    for line in lines[:5]:
+        if len(line) > 5 and len(line) < 80:
+            if not job_data.get("title"):
+                job_data["title"] = line
+            elif not job_data.get("company") and line != job_data["title"]:
+                job_data["company"] = line
+                break
+
+def finalize_job_data(job_data, container_text):
+    """Add the raw-text metadata; None when neither title nor company was found"""
+    job_data["raw_text"] = container_text[:500] if container_text else ""
+    job_data["extraction_method"] = "enhanced_iimjobs"
+    return job_data if (job_data.get("title") or job_data.get("company")) else None
+
+def build_job_data(card):
+    """Build a job record from a raw card dict.
+
+    card holds "text", "company", "title", "href", "has_img" and "logo" as
+    collected from one container, with company/title already chosen by the
+    COMPANY_SELECTORS / TITLE_SELECTORS rules.
+    """
+    container_text = (card.get("text") or "").strip()
+    if len(container_text) < 20:
+        return None
+
+    job_data = {}
+    if card.get("company"):
+        job_data["company"] = card["company"]
+    if card.get("title"):
+        job_data["title"] = card["title"]
+
+    job_data.update(extract_text_fields(container_text))
+
+    link = normalize_link(card.get("href"))
+    if link:
+        job_data["link"] = link
+
+    apply_line_fallback(job_data, container_text)
+
+    if not card.get("has_img"):
+        job_data["logo"] = ""
+    elif card.get("logo") and card["logo"].startswith("http"):
+        job_data["logo"] = card["logo"]
+
+    return finalize_job_data(job_data, container_text)
+
+
+# --- Snapshot parsing -------------------------------------------------------
+# A minimal DOM built with html.parser plus the subset of CSS the selectors
+# above use (tag, .class, #id, [attr], [attr*=v] and friends, :has(...) and
+# the descendant combinator).
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr"
+}
+
+SKIPPED_TEXT_TAGS = {"script", "style", "noscript", "template", "head"}
+
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl",
+    "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2",
+    "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p",
+    "pre", "section", "summary", "table", "tbody", "td", "tfoot", "th",
+    "thead", "tr", "ul"
+}
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = []
+        self.parent = parent
+
+    def iter_elements(self):
+        """Descendant elements in document order"""
+        stack = [child for child in reversed(self.children) if isinstance(child, Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, Node))
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: (value or "") for name, value in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: (value or "") for name, value in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open tag; stray end tags are ignored
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+def parse_html(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+def node_text(node, cache=None):
+    """Approximation of innerText: block elements start new lines, blank lines dropped"""
+    if cache is not None and id(node) in cache:
+        return cache[id(node)]
+
+    parts = []
+
+    def walk(current):
+        for child in current.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag in SKIPPED_TEXT_TAGS:
+                continue
+            elif child.tag == "br":
+                parts.append("\n")
+            elif child.tag in BLOCK_TAGS:
+                parts.append("\n")
+                walk(child)
+                parts.append("\n")
+            else:
+                walk(child)
+
+    walk(node)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    text = "\n".join(line for line in lines if line)
+
+    if cache is not None:
+        cache[id(node)] = text
+    return text
+
+_SIMPLE_SELECTOR = re.compile(r"""
+    (?P<tag>[a-zA-Z][a-zA-Z0-9-]*|\*)
+  | \.(?P<cls>[\w-]+)
+  | \#(?P<id>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~]?=)\s*(?P<quote>['"]?)(?P<val>.*?)(?P=quote)\s*)?\]
+  | :has\((?P<has>(?:[^()]|\([^()]*\))*)\)
+""", re.VERBOSE)
+
+_selector_cache = {}
+
+def _split_descendants(selector):
+    parts, depth, current = [], 0, ""
+    for char in selector.strip():
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        if char.isspace() and depth == 0:
+            if current:
+                parts.append(current)
+            current = ""
+        else:
+            current += char
+    if current:
+        parts.append(current)
+    return parts
+
+def _parse_compound(compound):
+    tests = []
+    pos = 0
+    while pos < len(compound):
+        match = _SIMPLE_SELECTOR.match(compound, pos)
+        if not match or (match.group("tag") and pos != 0):
+            raise ValueError(f"Unsupported selector: {compound}")
+        if match.group("tag"):
+            tests.append(("tag", match.group("tag").lower()))
+        elif match.group("cls"):
+            tests.append(("class", match.group("cls")))
+        elif match.group("id"):
+            tests.append(("attr", "id", "=", match.group("id")))
+        elif match.group("attr"):
+            tests.append(("attr", match.group("attr").lower(), match.group("op"), match.group("val")))
+        else:
+            tests.append(("has", compile_selector(match.group("has"))))
+        pos = match.end()
+    return tests
+
+def compile_selector(selector):
+    if selector not in _selector_cache:
+        _selector_cache[selector] = [_parse_compound(part) for part in _split_descendants(selector)]
+    return _selector_cache[selector]
+
+def _matches_compound(node, tests):
+    for test in tests:
+        kind = test[0]
+        if kind == "tag":
+            if test[1] != "*" and node.tag != test[1]:
+                return False
+        elif kind == "class":
+            if test[1] not in node.attrs.get("class", "").split():
+                return False
+        elif kind == "attr":
+            _, name, op, expected = test
+            if name not in node.attrs:
+                return False
+            value = node.attrs[name]
+            if op == "=" and value != expected:
+                return False
+            if op == "*=" and (not expected or expected not in value):
+                return False
+            if op == "^=" and (not expected or not value.startswith(expected)):
+                return False
+            if op == "$=" and (not expected or not value.endswith(expected)):
+                return False
+            if op == "~=" and expected not in value.split():
+                return False
+        elif kind == "has":
+            if not any(matches(descendant, test[1]) for descendant in node.iter_elements()):
+                return False
+    return True
+
+def matches(node, compiled):
+    if not _matches_compound(node, compiled[-1]):
+        return False
+    ancestor = node.parent
+    for tests in reversed(compiled[:-1]):
+        while ancestor is not None and not (ancestor.tag != "#document" and _matches_compound(ancestor, tests)):
+            ancestor = ancestor.parent
+        if ancestor is None:
+            return False
+        ancestor = ancestor.parent
+    return True
+
+def select(node, selector):
+    """Descendants of node matching a CSS selector, in document order"""
+    compiled = compile_selector(selector)
+    return [element for element in node.iter_elements() if matches(element, compiled)]
+
+def select_one(node, selector):
+    compiled = compile_selector(selector)
+    for element in node.iter_elements():
+        if matches(element, compiled):
+            return element
+    return None
+
+def find_job_containers(root, max_jobs=50, text_cache=None):
+    """Same container discovery as extract_iimjobs_feed, against a parsed snapshot"""
+    for selector in JOB_CONTAINER_SELECTORS:
+        elements = select(root, selector)
+        if len(elements) > 1:
+            return elements
+
+    # Keyword fallback, scored like SCORE_CONTAINERS_JS: keep the innermost of nested
+    # candidates, take the best max_jobs * 2 and return them in document order
+    candidates = []
+    for div in select(root, "div"):
+        text = node_text(div, text_cache).lower()
+        keyword_count = sum(1 for keyword in JOB_KEYWORDS if keyword in text)
+        if keyword_count >= 2 and len(text) > 50:
+            candidates.append((div, keyword_count, len(text), len(candidates)))
+
+    candidate_ids = {id(candidate[0]) for candidate in candidates}
+    wrapper_ids = set()
+    for div, _, _, _ in candidates:
+        parent = div.parent
+        while parent is not None:
+            if id(parent) in candidate_ids:
+                wrapper_ids.add(id(parent))
+            parent = parent.parent
+
+    innermost = [candidate for candidate in candidates if id(candidate[0]) not in wrapper_ids]
+    best = sorted(innermost, key=lambda candidate: (-candidate[1], candidate[2]))[:max_jobs * 2]
+    potential_containers = [candidate[0] for candidate in sorted(best, key=lambda candidate: candidate[3])]
+
+    if len(potential_containers) > 3:
+        return potential_containers
+    return []
+
+def card_from_node(container, base_url="", text_cache=None):
+    """The raw card dict build_job_data expects, read from a parsed container"""
+    card = {"text": node_text(container, text_cache), "company": None, "title": None,
+            "href": None, "has_img": False, "logo": None}
+    if len(card["text"]) < 20:
+        return card
+
+    for selector in COMPANY_SELECTORS:
+        elem = select_one(container, selector)
+        text = node_text(elem, text_cache) if elem is not None else ""
+        if text and len(text) > 1 and len(text) < 100:
+            card["company"] = text
+            break
+
+    for selector in TITLE_SELECTORS:
+        elem = select_one(container, selector)
+        text = node_text(elem, text_cache) if elem is not None else ""
+        if text and text != card["company"] and len(text) > 3:
+            card["title"] = text
+            break
+
+    link = select_one(container, "a")
+    if link is not None and "href" in link.attrs:
+        card["href"] = urljoin(base_url, link.attrs["href"])
+
+    img = select_one(container, "img")
+    if img is not None:
+        card["has_img"] = True
+        if "src" in img.attrs:
+            card["logo"] = urljoin(base_url, img.attrs["src"])
+
+    return card
+
+def extract_jobs_from_html(html, max_jobs=50, base_url="", skip=()):
+    """Full feed extraction from a page_source snapshot; safe to run in a worker process.
+    Jobs whose identity is in skip (already extracted from an earlier snapshot of the
+    same feed) are left out and do not count toward max_jobs"""
+    root = parse_html(html)
+    text_cache = {}
+    jobs = []
+
+    for container in find_job_containers(root, max_jobs + len(skip), text_cache):
+        if len(jobs) >= max_jobs:
+            break
+        job_data = build_job_data(card_from_node(container, base_url, text_cache))
+        if job_data and job_identity(job_data) not in skip:
+            jobs.append(job_data)
+
+    return jobs
+
+_snapshot_pool = None
+_snapshot_pool_lock = threading.Lock()
+
+def snapshot_pool():
+    """Process pool that parses page_source snapshots off the request thread.
+
+    Workers are spawned (forking a threaded server process can deadlock the
+    child) and only need this module. Spawned children also re-import the
+    script that was started, so app.py keeps everything that starts threads,
+    browsers or servers under its __main__ check"""
+    global _snapshot_pool
+    with _snapshot_pool_lock:
+        if _snapshot_pool is None:
+            _snapshot_pool = ProcessPoolExecutor(
+                max_workers=SNAPSHOT_PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(_snapshot_pool.shutdown, wait=False, cancel_futures=True)
+        return _snapshot_pool
+
+def submit_html_parse(html, max_jobs, base_url, skip=()):
+    """Parse a snapshot in the pool; returns a Future of its jobs"""
+    return snapshot_pool().submit(extract_jobs_from_html, html, max_jobs, base_url, frozenset(skip))
+
+# --- De-duplication -----------------------------------------------------------
+
+JOB_ID_PATTERN = re.compile(r'/j(?:ob)?/(?:[^/?#]*?-)?(\d{4,})(?:\.html?)?(?:[/?#]|$)')
+
+def job_id_from_link(link):
+    """Numeric IIMJobs job id from a job link, e.g. /j/finance-manager-1234567.html"""
+    if not link:
+        return None
+    match = JOB_ID_PATTERN.search(link)
+    return match.group(1) if match else None
+
+def _normalize_identity_text(text):
+    return " ".join(re.sub(r'[^\w\s]', ' ', (text or "").lower()).split())
+
+def job_identity(job):
+    """Stable identity of a job: its id when the link has one, else normalized title and company"""
+    job_id = job_id_from_link(job.get("link"))
+    if job_id:
+        return f"id:{job_id}"
+    return f"tc:{_normalize_identity_text(job.get('title'))}|{_normalize_identity_text(job.get('company'))}"
+
+class JobDedupIndex:
+    """Hash index of job identities, so each duplicate check is O(1)"""
+
+    def __init__(self):
+        self._seen = set()
+        self.dropped = 0
+        self.page_stats = []
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, job):
+        return job_identity(job) in self._seen
+
+    def add(self, job):
+        """Record the job; False if an identical job was already seen"""
+        key = job_identity(job)
+        if key in self._seen:
+            self.dropped += 1
+            return False
+        self._seen.add(key)
+        return True
+
+    def add_page(self, jobs, page):
+        """The jobs from one page/category that are new, recording per-page duplicate counts"""
+        new_jobs = [job for job in jobs if self.add(job)]
+        self.record_page(page, len(jobs), len(new_jobs))
+        return new_jobs
+
+    def record_page(self, page, found, added):
+        self.page_stats.append({"page": page, "found": found, "added": added, "duplicates": found - added})
+
+    def identities(self):
+        """Every identity seen so far, for extractors that should skip them"""
+        return frozenset(self._seen)
+
+    def summary(self):
+        return {"unique": len(self._seen), "duplicates_dropped": self.dropped, "pages": self.page_stats}
+
+# --- Job detail pages ---------------------------------------------------------
+
+def node_text_content(node):
+    """All descendant text, like DOM textContent"""
+    return "".join(child if isinstance(child, str) else node_text_content(child) for child in node.children)
+
+def _next_element_sibling(node):
+    siblings = [child for child in node.parent.children if isinstance(child, Node)]
+    index = siblings.index(node)
+    return siblings[index + 1] if index + 1 < len(siblings) else None
+
+def extract_job_details_from_html(html, url):
+    """extract_complete_job_details for a fetched job page, without a browser"""
+    root = parse_html(html)
+    text_cache = {}
+    job_details = {}
+
+    # Title
+    for selector in ["div.job-header h1", "h1"]:
+        elem = select_one(root, selector)
+        if elem is not None:
+            job_details["title"] = node_text(elem, text_cache)
+            break
+
+    # Experience & Location (from header spans)
+    spans = select(root, "div.job-header span")
+    if len(spans) >= 2:
+        job_details["experience"] = node_text(spans[0], text_cache)
+        job_details["location"] = node_text(spans[1], text_cache)
+
+    # Skills: "#tag" spans in the div right after the header
+    tags = []
+    for header in select(root, "div.job-header"):
+        sibling = _next_element_sibling(header)
+        if sibling is not None and sibling.tag == "div":
+            for tag in select(sibling, "span"):
+                text = node_text(tag, text_cache)
+                if text.startswith("#"):
+                    tags.append(text)
+    job_details["skills"] = tags
+
+    jd_text = "\n".join(
+        text for text in (node_text(p, text_cache) for p in select(root, "div[class*='MuiPaper-root'] p")) if text
+    )
+    if jd_text:
+        job_details["description"] = jd_text
+
+    requirements = [
+        text for text in (node_text(li, text_cache) for li in select(root, "div[class*='MuiPaper-root'] li")) if text
+    ]
+    if requirements:
+        job_details["requirements"] = requirements
+
+    buttons = select(root, "button")
+    apply_btn = [button for button in buttons if "Apply" in node_text_content(button)]
+    save_btn = [button for button in buttons if "Save" in node_text_content(button)]
+
+    save_text = node_text_content(save_btn[0]).strip() if save_btn else ""
+    if not save_text:
+        save_text = save_btn[0].attrs.get("aria-label") if save_btn else ""
+
+    job_details["application_info"] = {
+        "can_apply": len(apply_btn) > 0,
+        "can_save": len(save_btn) > 0,
+        "apply_button_text": node_text(apply_btn[0], text_cache) if apply_btn else None,
+        "save_button_text": save_text or None
+    }
+
+    job_details["job_url"] = url
+
+    return {k: v for k, v in job_details.items() if v}
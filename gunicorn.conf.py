@@ -0,0 +1,18 @@
+# Threaded workers: requests for different sessions run in parallel threads, while
+# requests for the same session are queued in order by the app's session scheduler.
+# Sessions live in process memory, so they are only visible to the worker that created them,
+# unless BROWSER_BROKER_ADDRESS (with BROWSER_BROKER_AUTHKEY) points every worker at a shared
+# browser broker (broker.py), which leases each session to one request at a time.
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+worker_class = "gthread"
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "300"))
+
+def post_fork(server, worker):
+    """Start each worker's warm browser pool now, so its first login does not launch Chrome cold"""
+    from app import warm_driver_pool
+
+    warm_driver_pool()
@@ -0,0 +1,338 @@
+"""Embedded SQLite store of scraped jobs, searchable without a browser.
+
+Jobs are upserted by identity (the job id when the link has one, otherwise
+normalized title and company) and carry first_seen / last_seen / last_changed
+timestamps. Company, location and posted date are indexed, and an FTS5 index
+covers title and raw_text.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from extraction import job_id_from_link, job_identity
+
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH", "jobs.db")
+
+# Incremental crawls: jobs remembered per user and source, and how many known jobs
+# in a row mean the rest of a newest-first feed has been seen before
+WATERMARK_MAX_JOBS = int(os.environ.get("WATERMARK_MAX_JOBS", "1000"))
+WATERMARK_KNOWN_RUN = int(os.environ.get("WATERMARK_KNOWN_RUN", "10"))
+
+# Bound parameters per "IN (...)" lookup; SQLite builds before 3.32 allow only 999
+SQLITE_MAX_VARIABLES = 500
+
+JOB_FIELDS = ("title", "company", "location", "experience", "salary", "job_type", "posted", "link", "logo", "raw_text")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    identity TEXT PRIMARY KEY,
+    job_id TEXT,
+    title TEXT,
+    company TEXT COLLATE NOCASE,
+    location TEXT COLLATE NOCASE,
+    experience TEXT,
+    salary TEXT,
+    job_type TEXT,
+    posted TEXT,
+    posted_date TEXT,
+    link TEXT,
+    logo TEXT,
+    raw_text TEXT,
+    content_hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_changed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_job_id ON jobs(job_id);
+CREATE INDEX IF NOT EXISTS jobs_company ON jobs(company);
+CREATE INDEX IF NOT EXISTS jobs_location ON jobs(location);
+CREATE INDEX IF NOT EXISTS jobs_posted_date ON jobs(posted_date);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs(last_seen);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    user TEXT NOT NULL,
+    source TEXT NOT NULL,
+    identity TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (user, source, identity)
+);
+CREATE INDEX IF NOT EXISTS watermarks_seen_at ON watermarks(user, source, seen_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(title, raw_text, content='jobs', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, raw_text) VALUES (new.rowid, new.title, new.raw_text);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, raw_text) VALUES ('delete', old.rowid, old.title, old.raw_text);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs
+WHEN old.title IS NOT new.title OR old.raw_text IS NOT new.raw_text BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, raw_text) VALUES ('delete', old.rowid, old.title, old.raw_text);
+    INSERT INTO jobs_fts(rowid, title, raw_text) VALUES (new.rowid, new.title, new.raw_text);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO jobs (identity, job_id, title, company, location, experience, salary, job_type, posted,
+                  posted_date, link, logo, raw_text, content_hash, first_seen, last_seen, last_changed)
+VALUES (:identity, :job_id, :title, :company, :location, :experience, :salary, :job_type, :posted,
+        :posted_date, :link, :logo, :raw_text, :content_hash, :seen, :seen, :seen)
+ON CONFLICT(identity) DO UPDATE SET
+    job_id = excluded.job_id,
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    experience = excluded.experience,
+    salary = excluded.salary,
+    job_type = excluded.job_type,
+    posted = excluded.posted,
+    posted_date = COALESCE(excluded.posted_date, jobs.posted_date),
+    link = excluded.link,
+    logo = excluded.logo,
+    raw_text = excluded.raw_text,
+    content_hash = excluded.content_hash,
+    last_seen = excluded.last_seen,
+    last_changed = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.last_changed ELSE excluded.last_seen END
+"""
+
+RELATIVE_POSTED_PATTERN = re.compile(r'(\d+)\s+(hour|day|week|month)s?\s+ago', re.IGNORECASE)
+
+def posted_date_from_text(posted, scraped_at):
+    """ISO date for relative texts like "Posted 3 Days Ago" or "Posted Today", as of scraped_at"""
+    if not posted:
+        return None
+    text = posted.lower()
+    scraped = datetime.fromtimestamp(scraped_at, timezone.utc)
+    if "today" in text or "few hours" in text:
+        return scraped.date().isoformat()
+    if "yesterday" in text:
+        return (scraped - timedelta(days=1)).date().isoformat()
+
+    match = RELATIVE_POSTED_PATTERN.search(text)
+    if not match:
+        return None
+    amount, unit = int(match.group(1)), match.group(2).lower()
+    days = {"hour": amount / 24, "day": amount, "week": amount * 7, "month": amount * 30}[unit]
+    return (scraped - timedelta(days=days)).date().isoformat()
+
+# Relative ages as they appear in card text ("Posted 3 Days Ago", "few hours ago"); they
+# change as a listing ages, so they are cut out of raw_text before hashing
+RELATIVE_AGE_PATTERN = re.compile(
+    r'(?:posted\s+)?(?:today|yesterday|(?:\d+|few|an?)\s+(?:hour|day|week|month)s?\s+ago)', re.IGNORECASE
+)
+
+def job_content_hash(job):
+    """Hash of the fields a listing change would show up in; the relative posted text is left
+    out, both as the posted field and inside raw_text"""
+    content = {field: job.get(field) or "" for field in JOB_FIELDS if field != "posted"}
+    raw_text = content["raw_text"]
+    if job.get("posted"):
+        raw_text = raw_text.replace(job["posted"], "")
+    content["raw_text"] = " ".join(RELATIVE_AGE_PATTERN.sub("", raw_text).split())
+    return hashlib.sha1(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+def fts_query(text):
+    """User search text as an FTS5 query: every word must appear, matched as a prefix"""
+    words = re.findall(r'\w+', text or "")
+    return " ".join(f'"{word}"*' for word in words)
+
+class CrawlWatermark:
+    """Jobs a user already received from one source. Classifies a repeat scrape's jobs as
+    new, changed or known, and says when a run of known ones means the rest is old too.
+    Known jobs are kept in unchanged, so the store still sees them as alive"""
+
+    def __init__(self, known, stop_after=WATERMARK_KNOWN_RUN):
+        self.known = known  # identity -> content_hash from earlier scrapes
+        self.stop_after = stop_after
+        self.seen = {}  # identity -> content_hash, everything this scrape saw
+        self.unchanged = []  # known jobs this scrape saw again, left out of the response
+        self.known_run = 0
+        self.counts = {"new": 0, "changed": 0, "known": 0}
+
+    def is_new_or_changed(self, job):
+        identity = job_identity(job)
+        content_hash = job_content_hash(job)
+        self.seen[identity] = content_hash
+
+        previous = self.known.get(identity)
+        if previous == content_hash:
+            self.unchanged.append(job)
+            self.counts["known"] += 1
+            self.known_run += 1
+            return False
+        self.counts["new" if previous is None else "changed"] += 1
+        self.known_run = 0
+        return True
+
+    def filter(self, jobs):
+        return [job for job in jobs if self.is_new_or_changed(job)]
+
+    @property
+    def should_stop(self):
+        return bool(self.known) and self.known_run >= self.stop_after
+
+    def summary(self):
+        return dict(self.counts, first_scrape=not self.known, stopped_early=self.should_stop)
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+class JobStore:
+    """Thread-safe wrapper around one SQLite file; each thread keeps its own connection"""
+
+    def __init__(self, path):
+        self.path = path
+        self._tls = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self.stats = {"saved": 0, "inserted": 0, "changed": 0, "searches": 0}
+        self._stats_lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._tls, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    connection.executescript(SCHEMA)
+                    self._schema_ready = True
+            self._tls.connection = connection
+        return connection
+
+    def save(self, jobs, scraped_at=None):
+        """Upsert scraped jobs in one transaction; returns (inserted, changed) counts"""
+        if not jobs:
+            return 0, 0
+        scraped_at = scraped_at or time.time()
+        by_identity = {}  # a job repeated in one batch is one row; the last copy wins, as the upsert would
+        for job in jobs:
+            row = {field: job.get(field) for field in JOB_FIELDS}
+            row.update(
+                identity=job_identity(job),
+                job_id=job_id_from_link(job.get("link")),
+                posted_date=posted_date_from_text(job.get("posted"), scraped_at),
+                content_hash=job_content_hash(job),
+                seen=scraped_at
+            )
+            by_identity[row["identity"]] = row
+        rows = list(by_identity.values())
+
+        connection = self._connection()
+        with connection:
+            identities = list(by_identity)
+            known = {}
+            for start in range(0, len(identities), SQLITE_MAX_VARIABLES):
+                chunk = identities[start:start + SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                known.update(connection.execute(
+                    f"SELECT identity, content_hash FROM jobs WHERE identity IN ({placeholders})", chunk
+                ).fetchall())
+            connection.executemany(UPSERT_SQL, rows)
+
+        inserted = sum(1 for row in rows if row["identity"] not in known)
+        changed = sum(1 for row in rows if row["identity"] in known and known[row["identity"]] != row["content_hash"])
+        with self._stats_lock:
+            self.stats["saved"] += len(rows)
+            self.stats["inserted"] += inserted
+            self.stats["changed"] += changed
+        return inserted, changed
+
+    def load_watermark(self, user, source):
+        rows = self._connection().execute(
+            "SELECT identity, content_hash FROM watermarks WHERE user = ? AND source = ?", (user or "", source)
+        ).fetchall()
+        return CrawlWatermark(dict(rows))
+
+    def save_watermark(self, user, source, watermark):
+        """Remember every job this scrape saw, keeping the WATERMARK_MAX_JOBS most recently seen"""
+        if not watermark.seen:
+            return
+        user = user or ""
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO watermarks (user, source, identity, content_hash, seen_at) VALUES (?, ?, ?, ?, ?)",
+                [(user, source, identity, content_hash, now) for identity, content_hash in watermark.seen.items()]
+            )
+            connection.execute(
+                """DELETE FROM watermarks WHERE user = ? AND source = ? AND identity NOT IN (
+                       SELECT identity FROM watermarks WHERE user = ? AND source = ? ORDER BY seen_at DESC LIMIT ?
+                   )""",
+                (user, source, user, source, WATERMARK_MAX_JOBS)
+            )
+
+    def search(self, q=None, company=None, location=None, job_id=None, posted_since=None, seen_since=None,
+               limit=20, offset=0):
+        """Filtered, paginated jobs with freshness timestamps; full-text matches are ranked by relevance"""
+        clauses, params = [], []
+        source = "jobs"
+        order = "jobs.last_seen DESC"
+
+        if q and fts_query(q):
+            # CROSS JOIN keeps the full-text match as the outer loop; otherwise SQLite may
+            # walk the company/location index and re-run the MATCH for every row
+            source = "jobs_fts CROSS JOIN jobs ON jobs.rowid = jobs_fts.rowid"
+            clauses.append("jobs_fts MATCH ?")
+            params.append(fts_query(q))
+            order = "bm25(jobs_fts)"
+        if company:
+            clauses.append("jobs.company = ?")
+            params.append(company)
+        if location:
+            clauses.append("jobs.location LIKE ?")
+            params.append(location.replace("%", "").replace("_", "") + "%")
+        if job_id:
+            clauses.append("jobs.job_id = ?")
+            params.append(str(job_id))
+        if posted_since:
+            clauses.append("jobs.posted_date >= ?")
+            params.append(posted_since)
+        if seen_since:
+            clauses.append("jobs.last_seen >= ?")
+            params.append(float(seen_since))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        connection = self._connection()
+        total = connection.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT jobs.* FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+
+        with self._stats_lock:
+            self.stats["searches"] += 1
+
+        now = time.time()
+        jobs = []
+        for row in rows:
+            job = {field: row[field] for field in JOB_FIELDS if row[field] is not None}
+            job.update(
+                job_id=row["job_id"],
+                posted_date=row["posted_date"],
+                first_seen=_iso(row["first_seen"]),
+                last_seen=_iso(row["last_seen"]),
+                last_changed=_iso(row["last_changed"]),
+                age_seconds=round(now - row["last_seen"])
+            )
+            jobs.append(job)
+        return {"jobs": jobs, "total": total, "limit": limit, "offset": offset}
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        try:
+            stats["jobs"] = self._connection().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        stats["path"] = self.path
+        return stats